@@ -1,113 +1,38 @@
 import os
 import math
-import time
 import numpy as np
 import tkinter as tk
 from tkinter import filedialog, messagebox
-import random
 
 try:
-    from PIL import Image, ImageTk
+    import PIL  # hanya memeriksa Pillow terpasang; citra dibuka lewat cipher/container/preview
 except ImportError:
     messagebox.showerror("Error", "Library Pillow tidak ditemukan.\nJalankan: pip install Pillow")
     exit()
 
-try:
-    from matplotlib.figure import Figure
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-except ImportError:
-    messagebox.showerror("Error", "Library Matplotlib tidak ditemukan.\nJalankan: pip install matplotlib")
-    exit()
+from cipher import encrypt_file, decrypt_file
+from container import open_as_image, new_salt
+from preview import load_preview
+from image_stats import npcr_uaci, analyze_image, adjacent_pair_sample
+from sweep import run_sweep, perturbation_keys, write_csv as write_sweep_csv, format_summary as format_sweep_summary
+from jobs import JobRunner
+from perf_log import StageTimer, write_record
+import perf_log
 
-def arnold_cat_map(image_array, iterasi):
-    """Mengacak posisi piksel menggunakan ACM dengan parameter a=1, b=1."""
-    a, b = 1, 1
-    n = image_array.shape[0]
-    processed_array = np.copy(image_array)
-    for _ in range(iterasi):
-        temp_array = np.zeros_like(processed_array)
-        for y in range(n):
-            for x in range(n):
-                x_baru = (x + a * y) % n
-                y_baru = (b * x + (a * b + 1) * y) % n
-                temp_array[y_baru, x_baru] = processed_array[y, x]
-        processed_array = temp_array
-    return processed_array
-
-def inverse_arnold_cat_map(image_array, iterasi):
-    """Mengembalikan posisi piksel menggunakan invers ACM dengan parameter a=1, b=1."""
-    a, b = 1, 1
-    n = image_array.shape[0]
-    processed_array = np.copy(image_array)
-    for _ in range(iterasi):
-        temp_array = np.zeros_like(processed_array)
-        for y in range(n):
-            for x in range(n):
-                x_baru = ((a * b + 1) * x - a * y) % n
-                y_baru = (-b * x + y) % n
-                temp_array[y_baru, x_baru] = processed_array[y, x]
-        processed_array = temp_array
-    return processed_array
-
-def generate_keystream_duffing_map(n, x0, y0, channels=3):
-    """Menghasilkan keystream menggunakan Duffing Map untuk jumlah kanal yang sesuai."""
-    duffing_a, duffing_b = 2.75, 0.2
-    total_values = n * n * channels
-    keystream_sequence = []
-    x, y = x0, y0
-    
-    # "Warm-up" iterasi
-    for _ in range(1000):
-        x_new = y
-        y_new = -duffing_b * x + duffing_a * y - y**3
-        x, y = x_new, y_new
-        
-    # Generate nilai untuk keystream
-    for _ in range(total_values):
-        x_new = y
-        y_new = -duffing_b * x + duffing_a * y - y**3
-        x, y = x_new, y_new
-        key_val = int(abs(y) % 1 * 256)
-        keystream_sequence.append(key_val)
-        
-    keystream_array = np.array(keystream_sequence, dtype=np.uint8)
-    if channels == 1:
-        return keystream_array.reshape((n, n))
-    else:
-        return keystream_array.reshape((n, n, 3))
-
-def calculate_pixel_correlation(image_array, num_pixels=5000):
-    if image_array.ndim == 3:
-        image_array = np.array(Image.fromarray(image_array).convert('L'))
-    h, w = image_array.shape
-
-    x_h, y_h, x_v, y_v, x_d, y_d = [], [], [], [], [], []
-    num_pixels = min(num_pixels, (w - 1) * (h - 1))
-    if num_pixels <= 0: return (0,0,0)
-
-    for _ in range(num_pixels):
-        x = random.randint(0, w - 2); y = random.randint(0, h - 2)
-        x_h.append(image_array[y, x]); y_h.append(image_array[y, x + 1])
-        x_v.append(image_array[y, x]); y_v.append(image_array[y + 1, x])
-        x_d.append(image_array[y, x]); y_d.append(image_array[y + 1, x + 1])
-    
-    corr_h = np.corrcoef(x_h, y_h)[0, 1] if len(x_h) > 1 else 0
-    corr_v = np.corrcoef(x_v, y_v)[0, 1] if len(x_v) > 1 else 0
-    corr_d = np.corrcoef(x_d, y_d)[0, 1] if len(x_d) > 1 else 0
-    return corr_h, corr_v, corr_d
-
-def calculate_entropy(image_array):
-    if image_array.ndim == 2: channels = [image_array]
-    else: channels = [image_array[:, :, i] for i in range(3)]
-    total_entropy = 0
-    for channel in channels:
-        counts = np.histogram(channel, bins=256, range=(0, 256))[0]
-        total_pixels = counts.sum()
-        if total_pixels == 0: continue
-        probabilities = counts / total_pixels
-        channel_entropy = -np.sum(probabilities[probabilities > 0] * np.log2(probabilities[probabilities > 0]))
-        total_entropy += channel_entropy
-    return total_entropy / len(channels)
+# ImageTk dan matplotlib baru diimpor saat pertama dipakai (pratinjau pertama / halaman Analisis)
+# agar jendela utama tampil secepatnya
+def photo_image(img):
+    from PIL import ImageTk
+    return ImageTk.PhotoImage(img)
+
+def load_matplotlib():
+    """Mengimpor Figure dan FigureCanvasTkAgg; melempar ImportError dengan pesan instalasi."""
+    try:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    except ImportError:
+        raise ImportError("Library Matplotlib tidak ditemukan.\nJalankan: pip install matplotlib")
+    return Figure, FigureCanvasTkAgg
 
 def format_file_size(size_bytes):
     if size_bytes == 0: return "0 B"
@@ -117,6 +42,11 @@ def format_file_size(size_bytes):
         return f"{s} {size_names[i]}"
     except (ValueError, IndexError): return "N/A"
 
+def format_correlation(values):
+    """Korelasi satu arah: rata-rata kanal, ditambah nilai per kanal R/G/B untuk citra berwarna."""
+    if len(values) == 1: return f"{values[0]:.4f}"
+    return f"{np.mean(values):.4f} (" + ", ".join(f"{c} {v:.4f}" for c, v in zip("RGB", values)) + ")"
+
 class HomePage(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent)
@@ -142,10 +72,37 @@ class BasePage(tk.Frame):
         tk.Label(params_frame, text="b:").grid(row=2, column=0, sticky="w", pady=2)
         self.entry_y0 = tk.Entry(params_frame, width=12); self.entry_y0.grid(row=2, column=1, pady=2); self.entry_y0.insert(0, "0.1")
 
+    def submit_job(self, func, *args, label="", on_done=None, error_title="Error", **kwargs):
+        """Menjalankan `func(*args, **kwargs)` di job runner latar; status_label menampilkan progres langsung."""
+        def on_error(job, e):
+            self.jobs.discard(job); self.status_label.config(text=f"{job.label} gagal.")
+            messagebox.showerror(error_title, f"Proses gagal: {e}")
+        def on_cancel(job):
+            self.jobs.discard(job); self.status_label.config(text=f"{job.label} dibatalkan.")
+        def finished(job, result):
+            self.jobs.discard(job); on_done(job, result)
+        job = self.controller.job_runner.submit(func, *args, label=label, on_progress=self.show_job_progress, on_done=finished, on_error=on_error, on_cancel=on_cancel, **kwargs)
+        self.jobs.add(job)
+        queued = self.controller.job_runner.pending_count - 1
+        self.status_label.config(text=f"{label}: menunggu ({queued} job di depan)" if queued > 0 else f"{label}: dimulai...")
+        return job
+
+    def show_job_progress(self, job, stage, fraction):
+        text = f"{job.label} — {stage}" + (f" {fraction:.0%}" if fraction is not None else "") + f" ({job.elapsed:.1f} detik)"
+        queued = self.controller.job_runner.pending_count - 1
+        if queued > 0: text += f", {queued} job dalam antrian"
+        self.status_label.config(text=text)
+
+    def cancel_jobs(self):
+        """Membatalkan semua job milik halaman ini (yang berjalan maupun yang masih antri)."""
+        for job in list(self.jobs): job.cancel()
+        if self.jobs: self.status_label.config(text="Membatalkan...")
+
 class EncryptionPage(BasePage):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent); self.controller = controller
-        self.fpath, self.fpath2 = "", ""; self.photo_asli, self.photo_enkripsi = None, None
+        self.fpath, self.fpath2 = "", ""; self.photo_asli, self.photo_enkripsi = None, None; self.jobs = set()
+        self.container_salt = new_salt()
         self.setup_widgets()
 
     def setup_widgets(self):
@@ -157,6 +114,8 @@ class EncryptionPage(BasePage):
         self.label_folder = tk.Label(path_frame, text="Folder Output: (Belum dipilih)", anchor="w"); self.label_folder.grid(row=1, column=0, sticky="ew")
         tk.Button(path_frame, text="Browse...", command=self.browse_output_folder).grid(row=1, column=1, padx=5)
         path_frame.columnconfigure(0, weight=1)
+        self.var_container = tk.BooleanVar(value=False)
+        tk.Checkbutton(path_frame, text="Simpan sebagai kontainer .acm (tanpa kompresi PNG)", variable=self.var_container).grid(row=2, column=0, sticky="w")
         self.setup_key_widgets(control_frame)
         preview_frame = tk.Frame(self, padx=10, pady=10); preview_frame.pack(fill="both", expand=True)
         frame_asli = tk.LabelFrame(preview_frame, text="Citra Asli", font=("Arial", 10, "bold")); frame_asli.pack(side="left", fill="both", expand=True, padx=5)
@@ -167,6 +126,8 @@ class EncryptionPage(BasePage):
         self.status_label = tk.Label(status_frame, text="Belum ada proses yang dijalankan."); self.status_label.pack()
         action_frame = tk.Frame(self); action_frame.pack(side="bottom", fill="x", pady=5)
         tk.Button(action_frame, text="ENKRIPSI GAMBAR", height=2, bg="#4CAF50", fg="white", font=("Arial", 10, "bold"), command=self.encrypt_image).pack(side="right", padx=10)
+        tk.Button(action_frame, text="Uji Sensitivitas Kunci", height=2, command=self.key_sweep).pack(side="right", padx=(0, 10))
+        tk.Button(action_frame, text="Batal", height=2, command=self.cancel_jobs).pack(side="right")
         tk.Button(action_frame, text="Kembali ke Menu", height=2, command=lambda: self.controller.show_frame("HomePage")).pack(side="left", padx=10)
 
     def browse_file(self):
@@ -178,7 +139,7 @@ class EncryptionPage(BasePage):
         if fpath2: self.fpath2 = fpath2; self.label_folder.config(text="Output: " + fpath2)
     
     def display_image(self, fp, target, attr):
-        try: img = Image.open(fp); img.thumbnail((350, 350), Image.LANCZOS); photo = ImageTk.PhotoImage(img); target.config(image=photo, text=""); setattr(self, attr, photo)
+        try: img = load_preview(fp, (350, 350)); photo = photo_image(img); target.config(image=photo, text=""); setattr(self, attr, photo)
         except Exception as e: messagebox.showerror("Error Tampil Gambar", f"Gagal memuat gambar: {e}")
 
     def encrypt_image(self):
@@ -192,49 +153,46 @@ class EncryptionPage(BasePage):
             messagebox.showerror("Error Input", "Pastikan semua parameter kunci diisi dengan benar (angka).")
             return
             
+        timer = StageTimer("encrypt", file=os.path.basename(self.fpath), source="gui")
+        output_format = "acm" if self.var_container.get() else "png"
+        self.submit_job(encrypt_file, self.fpath, self.fpath2, iterasi, x0, y0, timer=timer, output_format=output_format, salt=self.container_salt, preview_box=(350, 350), label="Enkripsi " + os.path.basename(self.fpath), on_done=self.on_encrypt_done, error_title="Error Enkripsi")
+
+    def key_sweep(self):
+        """Sweep kunci di sekitar kunci saat ini (a/b +- k*1e-10, iterasi +- k) dan perbandingan semua pasangan ciphertext."""
+        if not self.fpath:
+            messagebox.showerror("Error", "Pilih file input terlebih dahulu.")
+            return
         try:
-            start_time = time.time()
-            img = Image.open(self.fpath)
-            
-            original_mode = img.mode
-            if original_mode not in ['L', 'RGB']:
-                img = img.convert('RGB')
-                original_mode = 'RGB'
-
-            w, h = img.size
-            if w != h: 
-                size = min(w, h)
-                img = img.resize((size, size), Image.LANCZOS)
-                if img.mode != original_mode:
-                    img = img.convert(original_mode)
-            
-            arr = np.array(img)
-            channels = 1 if arr.ndim == 2 else 3
+            iterasi = int(self.entry_iterasi.get())
+            x0, y0 = float(self.entry_x0.get()), float(self.entry_y0.get())
+        except ValueError:
+            messagebox.showerror("Error Input", "Pastikan semua parameter kunci diisi dengan benar (angka).")
+            return
+        keys = perturbation_keys(iterasi, x0, y0, steps=2, delta=1e-10)
+        self.submit_job(run_sweep, self.fpath, keys, label=f"Sweep {len(keys)} kunci", on_done=self.on_sweep_done, error_title="Error Sweep Kunci")
 
-            permuted_arr = arnold_cat_map(arr, iterasi)
-            keystream = generate_keystream_duffing_map(permuted_arr.shape[0], x0, y0, channels=channels)
-            final_arr = np.bitwise_xor(permuted_arr, keystream)
+    def on_sweep_done(self, job, result):
+        summary = format_sweep_summary(result); saved = ""
+        if self.fpath2:
+            csv_path = os.path.join(self.fpath2, "KeySweep_" + os.path.splitext(os.path.basename(self.fpath))[0] + ".csv")
+            try: write_sweep_csv(result, csv_path); saved = f"\nTabel pasangan disimpan di {os.path.basename(csv_path)}"
+            except OSError as e: saved = f"\nGagal menyimpan CSV: {e}"
+        self.status_label.config(text=summary.splitlines()[0] + saved)
+        messagebox.showinfo("Uji Sensitivitas Kunci", summary + saved)
 
-            encrypted_img = Image.fromarray(final_arr.astype('uint8'), mode=original_mode)
-            
-            base = os.path.basename(self.fpath)
-            name, _ = os.path.splitext(base)
-            out_fn = "Encrypted_" + name + ".png"
-            saved_path = os.path.join(self.fpath2, out_fn)
-            encrypted_img.save(saved_path, format='PNG')
-            
-            self.display_image(saved_path, self.panel_enkripsi, "photo_enkripsi")
-            end_time = time.time()
-            elapsed_time = end_time - start_time
-            self.status_label.config(text=f"Waktu Proses: {elapsed_time:.2f} detik. File disimpan di {out_fn}")
-            messagebox.showinfo("Sukses", f"Gambar berhasil dienkripsi!\nDisimpan sebagai: {out_fn}\nWaktu Proses: {elapsed_time:.2f} detik.")
-        except Exception as e:
-            messagebox.showerror("Error Enkripsi", f"Proses enkripsi gagal: {e}")
+    def on_encrypt_done(self, job, saved_path):
+        out_fn = os.path.basename(saved_path)
+        timer = job.kwargs["timer"]
+        with timer.stage("Pratinjau"): self.display_image(saved_path, self.panel_enkripsi, "photo_enkripsi")
+        write_record(timer.finish())
+        elapsed_time = timer.total_seconds
+        self.status_label.config(text=f"Waktu Proses: {elapsed_time:.2f} detik. File disimpan di {out_fn}\n{timer.summary()}")
+        messagebox.showinfo("Sukses", f"Gambar berhasil dienkripsi!\nDisimpan sebagai: {out_fn}\nWaktu Proses: {elapsed_time:.2f} detik.")
 
 class DecryptionPage(BasePage):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent); self.controller = controller
-        self.fpath, self.fpath2 = "", ""; self.photo_enkripsi, self.photo_dekripsi = None, None
+        self.fpath, self.fpath2 = "", ""; self.photo_enkripsi, self.photo_dekripsi = None, None; self.jobs = set()
         self.setup_widgets()
         
     def setup_widgets(self):
@@ -256,10 +214,11 @@ class DecryptionPage(BasePage):
         self.status_label = tk.Label(status_frame, text="Belum ada proses yang dijalankan."); self.status_label.pack()
         action_frame = tk.Frame(self); action_frame.pack(side="bottom", fill="x", pady=5)
         tk.Button(action_frame, text="DEKRIPSI GAMBAR", height=2, bg="#FF9800", fg="white", font=("Arial", 10, "bold"), command=self.decrypt_image).pack(side="right", padx=10)
+        tk.Button(action_frame, text="Batal", height=2, command=self.cancel_jobs).pack(side="right")
         tk.Button(action_frame, text="Kembali ke Menu", height=2, command=lambda: self.controller.show_frame("HomePage")).pack(side="left", padx=10)
     
     def browse_file(self):
-        fpath = filedialog.askopenfilename(filetypes=(("Image files", "*.png *.jpg *.jpeg *.bmp"), ("All files", "*.*")))
+        fpath = filedialog.askopenfilename(filetypes=(("Image files", "*.png *.jpg *.jpeg *.bmp *.acm"), ("All files", "*.*")))
         if fpath: self.fpath = fpath; self.label_file.config(text="Input: " + os.path.basename(fpath)); self.display_image(self.fpath, self.panel_enkripsi, "photo_enkripsi"); self.panel_dekripsi.config(image=None, text="Hasil dekripsi akan tampil di sini"); self.photo_dekripsi = None
     
     def browse_output_folder(self):
@@ -267,7 +226,7 @@ class DecryptionPage(BasePage):
         if fpath2: self.fpath2 = fpath2; self.label_folder.config(text="Output: " + fpath2)
     
     def display_image(self, fp, target, attr):
-        try: img = Image.open(fp); img.thumbnail((350, 350), Image.LANCZOS); photo = ImageTk.PhotoImage(img); target.config(image=photo, text=""); setattr(self, attr, photo)
+        try: img = load_preview(fp, (350, 350)); photo = photo_image(img); target.config(image=photo, text=""); setattr(self, attr, photo)
         except Exception as e: messagebox.showerror("Error Tampil Gambar", f"Gagal memuat gambar: {e}")
 
     def decrypt_image(self):
@@ -280,37 +239,22 @@ class DecryptionPage(BasePage):
         except ValueError:
             messagebox.showerror("Error Input", "Pastikan semua parameter kunci diisi dengan benar (angka).")
             return
-        try:
-            start_time = time.time()
-            img = Image.open(self.fpath)
-            original_mode = img.mode
-            
-            encrypted_arr = np.array(img)
-            channels = 1 if encrypted_arr.ndim == 2 else 3
+        timer = StageTimer("decrypt", file=os.path.basename(self.fpath), source="gui")
+        self.submit_job(decrypt_file, self.fpath, self.fpath2, iterasi, x0, y0, timer=timer, preview_box=(350, 350), label="Dekripsi " + os.path.basename(self.fpath), on_done=self.on_decrypt_done, error_title="Error Dekripsi")
 
-            keystream = generate_keystream_duffing_map(encrypted_arr.shape[0], x0, y0, channels=channels)
-            undiffused_arr = np.bitwise_xor(encrypted_arr, keystream)
-            decrypted_arr = inverse_arnold_cat_map(undiffused_arr, iterasi)
-            
-            decrypted_img = Image.fromarray(decrypted_arr.astype('uint8'), mode=original_mode)
-            
-            base = os.path.basename(self.fpath)
-            out_fn = "Decrypted_" + base[10:] if base.startswith("Encrypted_") else "Decrypted_" + base
-            saved_path = os.path.join(self.fpath2, out_fn)
-            decrypted_img.save(saved_path)
-            
-            self.display_image(saved_path, self.panel_dekripsi, "photo_dekripsi")
-            end_time = time.time()
-            elapsed_time = end_time - start_time
-            self.status_label.config(text=f"Waktu Proses: {elapsed_time:.2f} detik. File disimpan.")
-            messagebox.showinfo("Sukses", f"Gambar berhasil didekripsi!")
-        except Exception as e:
-            messagebox.showerror("Error Dekripsi", f"Proses dekripsi gagal: {e}")
-
-class AnalysisPage(tk.Frame):
+    def on_decrypt_done(self, job, saved_path):
+        timer = job.kwargs["timer"]
+        with timer.stage("Pratinjau"): self.display_image(saved_path, self.panel_dekripsi, "photo_dekripsi")
+        write_record(timer.finish())
+        elapsed_time = timer.total_seconds
+        self.status_label.config(text=f"Waktu Proses: {elapsed_time:.2f} detik. File disimpan.\n{timer.summary()}")
+        messagebox.showinfo("Sukses", f"Gambar berhasil didekripsi!")
+
+class AnalysisPage(BasePage):
     def __init__(self, parent, controller):
+        self.Figure, self.FigureCanvasTkAgg = load_matplotlib()
         tk.Frame.__init__(self, parent); self.controller = controller
-        self.fpath_asli, self.fpath_enkripsi = "", ""
+        self.fpath_asli, self.fpath_enkripsi = "", ""; self.jobs = set()
         self.photo_asli_preview, self.photo_enkripsi_preview = None, None
         self.setup_widgets()
 
@@ -323,24 +267,38 @@ class AnalysisPage(tk.Frame):
         tk.Button(top_control_frame, text="Browse Citra Terenkripsi...", command=self.browse_encrypted).pack(side="left")
         action_frame = tk.Frame(self); action_frame.pack(side="bottom", fill="x", pady=10, padx=10)
         tk.Button(action_frame, text="LAKUKAN ANALISIS", height=2, bg="#007BFF", fg="white", font=("Arial", 10, "bold"), command=self.perform_analysis).pack(side="right")
+        tk.Button(action_frame, text="Batal", height=2, command=self.cancel_jobs).pack(side="right", padx=10)
         tk.Button(action_frame, text="Kembali ke Menu", height=2, command=lambda: self.controller.show_frame("HomePage")).pack(side="left")
+        status_frame = tk.LabelFrame(self, text="Status Proses Terakhir", padx=10, pady=5); status_frame.pack(side="bottom", fill="x", padx=10)
+        self.status_label = tk.Label(status_frame, text="Belum ada proses yang dijalankan."); self.status_label.pack()
         content_frame = tk.Frame(self, padx=10, pady=5); content_frame.pack(fill="both", expand=True); content_frame.columnconfigure(0, weight=1); content_frame.rowconfigure(1, weight=1)
         preview_frame = tk.Frame(content_frame); preview_frame.grid(row=0, column=0, sticky="ew", pady=(0, 10))
         frame_asli = tk.LabelFrame(preview_frame, text="Pratinjau Asli", font=("Arial", 9)); frame_asli.pack(side="left", padx=5, fill="both", expand=True)
         self.panel_asli_preview = tk.Label(frame_asli, text="Pilih citra asli", bg="lightgrey"); self.panel_asli_preview.pack(fill="both", expand=True)
         frame_enkripsi = tk.LabelFrame(preview_frame, text="Pratinjau Terenkripsi", font=("Arial", 9)); frame_enkripsi.pack(side="left", padx=5, fill="both", expand=True)
         self.panel_enkripsi_preview = tk.Label(frame_enkripsi, text="Pilih citra terenkripsi", bg="lightgrey"); self.panel_enkripsi_preview.pack(fill="both", expand=True)
-        plot_frame = tk.LabelFrame(content_frame, text="Visualisasi Histogram", padx=5, pady=5); plot_frame.grid(row=1, column=0, sticky="nsew")
-        self.fig = Figure(figsize=(4, 1.5), dpi=80); self.ax1 = self.fig.add_subplot(121); self.ax2 = self.fig.add_subplot(122)
-        self.canvas = FigureCanvasTkAgg(self.fig, master=plot_frame); self.fig.subplots_adjust(left=0.1, right=0.9, bottom=0.2, top=0.8, wspace=0.4)
-        self.canvas.get_tk_widget().pack(side="top", fill="both", expand=True); self.canvas.draw()
+        plot_frame = tk.LabelFrame(content_frame, text="Visualisasi", padx=5, pady=5); plot_frame.grid(row=1, column=0, sticky="nsew")
+        view_frame = tk.Frame(plot_frame); view_frame.pack(side="top", fill="x")
+        self.var_plot_view = tk.StringVar(value="histogram")
+        tk.Radiobutton(view_frame, text="Histogram", variable=self.var_plot_view, value="histogram", command=self.render_plots).pack(side="left")
+        tk.Radiobutton(view_frame, text="Scatter piksel bertetangga (horizontal, kanal pertama)", variable=self.var_plot_view, value="scatter", command=self.render_plots).pack(side="left")
+        self.fig = self.Figure(figsize=(4, 1.5), dpi=80); self.ax1 = self.fig.add_subplot(121); self.ax2 = self.fig.add_subplot(122)
+        self.canvas = self.FigureCanvasTkAgg(self.fig, master=plot_frame); self.fig.subplots_adjust(left=0.1, right=0.9, bottom=0.2, top=0.8, wspace=0.4)
+        self.canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+        # Artist dibuat sekali lalu diperbarui di tempat (set_ydata/set_data) pada setiap analisis
+        self.last_result = None; self.plot_artists = {}; bins = np.arange(256)
+        for ax in (self.ax1, self.ax2):
+            lines = [ax.plot(bins, np.zeros(256), drawstyle="steps-mid", color=color, linewidth=0.8, visible=False)[0] for color in ("red", "green", "blue")]
+            points = ax.plot([], [], linestyle="none", marker=".", markersize=1, color="black", visible=False)[0]
+            ax.set_xlim(0, 255); self.plot_artists[ax] = (lines, points)
+        self.canvas.draw()
         metrics_frame = tk.LabelFrame(content_frame, text="Analisis Kuantitatif", padx=2, pady=2); metrics_frame.grid(row=2, column=0, sticky="ew", pady=(5, 0))
         metrics_frame.columnconfigure((1, 2), weight=1)
         tk.Label(metrics_frame, text="Properti/Metrik", font=("Arial", 10, "bold")).grid(row=0, column=0, sticky="w", padx=5)
         tk.Label(metrics_frame, text="Citra Asli", font=("Arial", 10, "bold")).grid(row=0, column=1, sticky="w", padx=5)
         tk.Label(metrics_frame, text="Citra Terenkripsi", font=("Arial", 10, "bold")).grid(row=0, column=2, sticky="w", padx=5)
         self.metric_labels = {}
-        metrics = ["Ukuran File:", "Dimensi:", "Entropi:", "Korelasi Horizontal:", "Korelasi Vertikal:", "Korelasi Diagonal:"]
+        metrics = ["Ukuran File:", "Dimensi:", "Entropi:", "Korelasi Horizontal:", "Korelasi Vertikal:", "Korelasi Diagonal:", "NPCR (vs Asli):", "UACI (vs Asli):"]
         for i, metric in enumerate(metrics, start=1):
             tk.Label(metrics_frame, text=metric, font=("Arial", 9, "bold")).grid(row=i, column=0, sticky="w", pady=1, padx=5)
             self.metric_labels[metric] = {"asli": tk.Label(metrics_frame, text="-", anchor="w"), "enkripsi": tk.Label(metrics_frame, text="-", anchor="w")}
@@ -348,7 +306,7 @@ class AnalysisPage(tk.Frame):
             self.metric_labels[metric]["enkripsi"].grid(row=i, column=2, sticky="w", padx=5)
 
     def display_image(self, fp, target, attr):
-        try: img = Image.open(fp); img.thumbnail((250, 250), Image.LANCZOS); photo = ImageTk.PhotoImage(img); target.config(image=photo, text=""); setattr(self, attr, photo)
+        try: img = load_preview(fp, (250, 250)); photo = photo_image(img); target.config(image=photo, text=""); setattr(self, attr, photo)
         except Exception as e: messagebox.showerror("Error Tampil Gambar", f"Gagal memuat gambar: {e}")
 
     def browse_original(self):
@@ -363,49 +321,67 @@ class AnalysisPage(tk.Frame):
         if not self.fpath_asli or not self.fpath_enkripsi:
             messagebox.showwarning("Peringatan", "Harap pilih kedua file.")
             return
-        try:
-            img_asli = Image.open(self.fpath_asli)
-            arr_asli = np.array(img_asli)
-            img_enkripsi = Image.open(self.fpath_enkripsi)
-            arr_enkripsi = np.array(img_enkripsi)
-            
-            self.metric_labels["Ukuran File:"]["asli"].config(text=format_file_size(os.path.getsize(self.fpath_asli)))
-            self.metric_labels["Ukuran File:"]["enkripsi"].config(text=format_file_size(os.path.getsize(self.fpath_enkripsi)))
-            self.metric_labels["Dimensi:"]["asli"].config(text=f"{img_asli.width}x{img_asli.height}")
-            self.metric_labels["Dimensi:"]["enkripsi"].config(text=f"{img_enkripsi.width}x{img_enkripsi.height}")
-            
-            self.metric_labels["Entropi:"]["asli"].config(text=f"{calculate_entropy(arr_asli):.4f}")
-            self.metric_labels["Entropi:"]["enkripsi"].config(text=f"{calculate_entropy(arr_enkripsi):.4f}")
-
-            corr_asli = calculate_pixel_correlation(arr_asli)
-            corr_enkripsi = calculate_pixel_correlation(arr_enkripsi)
-            self.metric_labels["Korelasi Horizontal:"]["asli"].config(text=f"{corr_asli[0]:.4f}")
-            self.metric_labels["Korelasi Horizontal:"]["enkripsi"].config(text=f"{corr_enkripsi[0]:.4f}")
-            self.metric_labels["Korelasi Vertikal:"]["asli"].config(text=f"{corr_asli[1]:.4f}")
-            self.metric_labels["Korelasi Vertikal:"]["enkripsi"].config(text=f"{corr_enkripsi[1]:.4f}")
-            self.metric_labels["Korelasi Diagonal:"]["asli"].config(text=f"{corr_asli[2]:.4f}")
-            self.metric_labels["Korelasi Diagonal:"]["enkripsi"].config(text=f"{corr_enkripsi[2]:.4f}")
-
-            self.ax1.clear(); self.ax2.clear()
-            self.ax1.set_title("Histogram Citra Asli")
-            if arr_asli.ndim == 2:
-                self.ax1.hist(arr_asli.flatten(), bins=256, color='gray')
-            else:
-                colors = ('red', 'green', 'blue')
-                for i, color in enumerate(colors):
-                    self.ax1.hist(arr_asli[:, :, i].flatten(), bins=256, color=color, alpha=0.7)
-            
-            self.ax2.set_title("Histogram Citra Terenkripsi")
-            if arr_enkripsi.ndim == 2:
-                self.ax2.hist(arr_enkripsi.flatten(), bins=256, color='gray')
+        timer = StageTimer("analysis", file=os.path.basename(self.fpath_enkripsi), source="gui")
+        self.submit_job(compute_analysis, self.fpath_asli, self.fpath_enkripsi, timer=timer, label="Analisis", on_done=self.show_analysis, error_title="Error Analisis")
+
+    def show_analysis(self, job, result):
+        timer = job.kwargs["timer"]
+        timer.start_stage("Tampilkan hasil")
+        asli, enkripsi = result["asli"], result["enkripsi"]
+        for key, report in (("asli", asli), ("enkripsi", enkripsi)):
+            self.metric_labels["Ukuran File:"][key].config(text=format_file_size(report["size_bytes"]))
+            self.metric_labels["Dimensi:"][key].config(text=f"{report['width']}x{report['height']}")
+            self.metric_labels["Entropi:"][key].config(text=f"{report['entropy']:.4f}")
+            for d, metric in enumerate(["Korelasi Horizontal:", "Korelasi Vertikal:", "Korelasi Diagonal:"]):
+                self.metric_labels[metric][key].config(text=format_correlation(report["correlation"][:, d]))
+
+        if result["npcr_uaci"] is not None:
+            npcr, uaci = result["npcr_uaci"]
+            self.metric_labels["NPCR (vs Asli):"]["enkripsi"].config(text=f"{npcr:.4f}%")
+            self.metric_labels["UACI (vs Asli):"]["enkripsi"].config(text=f"{uaci:.4f}%")
+        else:
+            self.metric_labels["NPCR (vs Asli):"]["enkripsi"].config(text="- (ukuran berbeda)")
+            self.metric_labels["UACI (vs Asli):"]["enkripsi"].config(text="- (ukuran berbeda)")
+
+        self.last_result = result; self.render_plots()
+        write_record(timer.finish())
+        self.status_label.config(text=f"Waktu Analisis: {timer.total_seconds:.2f} detik.\n{timer.summary()}")
+
+    def render_plots(self):
+        """Memperbarui artist histogram (hitungan bincount) atau scatter yang sudah ada, tanpa membangun ulang axes."""
+        if self.last_result is None: return
+        scatter = self.var_plot_view.get() == "scatter"
+        for ax, title, report in ((self.ax1, "Citra Asli", self.last_result["asli"]), (self.ax2, "Citra Terenkripsi", self.last_result["enkripsi"])):
+            lines, points = self.plot_artists[ax]
+            ax.set_title(("Scatter " if scatter else "Histogram ") + title)
+            histograms = report["histograms"]
+            for i, line in enumerate(lines):
+                line.set_visible(not scatter and i < len(histograms))
+                if i < len(histograms): line.set_ydata(histograms[i]); line.set_color("gray" if len(histograms) == 1 else ("red", "green", "blue")[i])
+            points.set_visible(scatter)
+            if scatter:
+                points.set_data(*report["scatter"]); ax.set_ylim(0, 255)
             else:
-                colors = ('red', 'green', 'blue')
-                for i, color in enumerate(colors):
-                    self.ax2.hist(arr_enkripsi[:, :, i].flatten(), bins=256, color=color, alpha=0.7)
-            
-            self.fig.tight_layout(); self.canvas.draw()
-        except Exception as e:
-            messagebox.showerror("Error Analisis", f"Gagal melakukan analisis: {e}")
+                ax.set_ylim(0, max(1, histograms.max()) * 1.05)
+        self.canvas.draw_idle()
+
+def compute_analysis(fpath_asli, fpath_enkripsi, progress=None, timer=None):
+    """Bagian berat analisis (dijalankan di worker): memuat kedua citra dan menghitung statistiknya."""
+    if timer: progress = timer.chain(progress)
+    result = {}
+    arrays = {}
+    for key, fpath in (("asli", fpath_asli), ("enkripsi", fpath_enkripsi)):
+        if progress: progress(f"Dekode citra {key}")
+        img = open_as_image(fpath)
+        arrays[key] = np.array(img)
+        if progress: progress(f"Statistik citra {key}")
+        result[key] = analyze_image(arrays[key])
+        result[key]["scatter"] = adjacent_pair_sample(arrays[key], "horizontal", max_points=5000)
+        result[key].update(width=img.width, height=img.height, size_bytes=os.path.getsize(fpath))
+    if progress: progress("NPCR/UACI")
+    same_shape = arrays["asli"].shape == arrays["enkripsi"].shape
+    result["npcr_uaci"] = npcr_uaci(arrays["asli"], arrays["enkripsi"]) if same_shape else None
+    return result
 
 class CryptoApp(tk.Tk):
     def __init__(self, *args, **kwargs):
@@ -413,15 +389,21 @@ class CryptoApp(tk.Tk):
         self.title("Aplikasi Kriptografi Citra v1.2 (Final Fix)")
         self.geometry("1100x850")
         self.title_font = ("Arial", 18, "bold")
-        container = tk.Frame(self); container.pack(side="top", fill="both", expand=True)
-        container.grid_rowconfigure(0, weight=1); container.grid_columnconfigure(0, weight=1)
-        self.frames = {}
-        for F in (HomePage, EncryptionPage, DecryptionPage, AnalysisPage):
-            page_name = F.__name__; frame = F(container, self); self.frames[page_name] = frame; frame.grid(row=0, column=0, sticky="nsew")
+        self.container = tk.Frame(self); self.container.pack(side="top", fill="both", expand=True)
+        self.container.grid_rowconfigure(0, weight=1); self.container.grid_columnconfigure(0, weight=1)
+        self.frames = {}; self.page_classes = {F.__name__: F for F in (HomePage, EncryptionPage, DecryptionPage, AnalysisPage)}
+        self.job_runner = JobRunner(self)
+        if perf_log.get_log_path() is None:
+            perf_log.configure(os.path.join(os.path.dirname(os.path.abspath(__file__)), "performance_log.jsonl"))
         self.show_frame("HomePage")
     
     def show_frame(self, page_name):
-        frame = self.frames[page_name]
+        """Menampilkan halaman; widget halaman baru dibuat saat pertama kali ditampilkan."""
+        frame = self.frames.get(page_name)
+        if frame is None:
+            try: frame = self.page_classes[page_name](self.container, self)
+            except ImportError as e: messagebox.showerror("Error", str(e)); return
+            self.frames[page_name] = frame; frame.grid(row=0, column=0, sticky="nsew")
         frame.tkraise()
 
 if __name__ == "__main__":
@@ -0,0 +1,175 @@
+"""
+Mode batch tanpa GUI: mengenkripsi/mendekripsi banyak citra secara paralel.
+
+Contoh:
+    python batch.py encrypt gambar/ -o hasil/ --iterasi 10 -a 0.1 -b 0.1 -j 4
+    python batch.py decrypt "hasil/Encrypted_*.png" -o asli/ --iterasi 10 -a 0.1 -b 0.1
+    python batch.py encrypt gambar/ -o hasil/ --format acm   # kontainer mentah .acm tanpa encode PNG
+
+Setiap worker proses membaca, mengacak, meng-XOR dan menyimpan citranya
+sendiri; nama file hasil mengikuti konvensi GUI (Encrypted_/Decrypted_).
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cipher import (IMAGE_EXTENSIONS, CONTAINER_EXTENSION, OUTPUT_FORMATS, encrypt_file, decrypt_file,
+                    encrypted_filename, decrypted_filename)
+from lowmem import encrypt_file_lowmem, decrypt_file_lowmem
+from pipeline import CipherPipeline
+from container import new_salt
+import perf_log
+
+
+def collect_inputs(source, extensions=IMAGE_EXTENSIONS):
+    """Daftar file citra dari sebuah direktori (difilter `extensions`) atau pola glob, terurut."""
+    if os.path.isdir(source):
+        paths = [os.path.join(source, f) for f in os.listdir(source)]
+        paths = [p for p in paths if os.path.isfile(p) and p.lower().endswith(extensions)]
+    else:
+        paths = [p for p in glob.glob(source) if os.path.isfile(p)]
+    return sorted(paths)
+
+
+def output_name(mode, fpath, memory_budget=None, output_format="png"):
+    """Nama file hasil `process_one` untuk `fpath` (mode hemat memori selalu mendekripsi ke PNG)."""
+    if mode == "encrypt":
+        return encrypted_filename(fpath, output_format)
+    name = decrypted_filename(fpath)
+    return os.path.splitext(name)[0] + ".png" if memory_budget else name
+
+
+def check_output_names(mode, paths, memory_budget=None, output_format="png"):
+    """Melempar ValueError jika beberapa input menghasilkan nama file output yang sama (mis. a.png dan a.jpg).
+
+    Tanpa pemeriksaan ini worker akan menimpa file yang sama dan salah satu hasil hilang diam-diam.
+    """
+    seen = {}
+    for fpath in paths:
+        seen.setdefault(os.path.normcase(output_name(mode, fpath, memory_budget, output_format)), []).append(fpath)
+    collisions = [inputs for inputs in seen.values() if len(inputs) > 1]
+    if collisions:
+        details = "; ".join(", ".join(os.path.basename(p) for p in inputs) for inputs in collisions)
+        raise ValueError(f"Beberapa input menghasilkan nama output yang sama: {details}")
+
+
+def process_one(mode, fpath, output_dir, iterasi, x0, y0, memory_budget=None, output_format="png", salt=None):
+    """Dijalankan di worker: memproses satu file dan mengembalikan (path_hasil, durasi, bytes_input).
+
+    Jika `memory_budget` (byte) diberikan, dipakai mode hemat memori dari `lowmem`.
+    `output_format` ("png"/"acm") dan `salt` kontainer hanya berlaku untuk enkripsi.
+    """
+    start_time = time.perf_counter()
+    if memory_budget and mode == "encrypt":
+        saved_path = encrypt_file_lowmem(fpath, output_dir, iterasi, x0, y0, memory_budget=memory_budget,
+                                         output_format=output_format, salt=salt)
+    elif memory_budget:
+        saved_path = decrypt_file_lowmem(fpath, output_dir, iterasi, x0, y0, memory_budget=memory_budget)
+    elif mode == "encrypt":
+        saved_path = encrypt_file(fpath, output_dir, iterasi, x0, y0, output_format=output_format, salt=salt)
+    else:
+        saved_path = decrypt_file(fpath, output_dir, iterasi, x0, y0)
+    return saved_path, time.perf_counter() - start_time, os.path.getsize(fpath)
+
+
+def run_batch(mode, paths, output_dir, iterasi, x0, y0, workers=None, on_result=None, memory_budget=None,
+              output_format="png"):
+    """Memproses semua `paths` dengan pool proses; mengembalikan daftar hasil per file.
+
+    Tiap hasil berupa dict dengan kunci input, output, seconds, bytes dan error.
+    `on_result` (opsional) dipanggil untuk setiap hasil begitu selesai.
+    `memory_budget` (byte, opsional) mengaktifkan mode hemat memori per worker.
+    `output_format` "png" atau "acm" (kontainer mentah) untuk hasil enkripsi.
+    """
+    if mode not in ("encrypt", "decrypt"):
+        raise ValueError(f"Mode tidak dikenal: {mode}")
+    check_output_names(mode, paths, memory_budget, output_format)
+    os.makedirs(output_dir, exist_ok=True)
+    salt = new_salt()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_one, mode, p, output_dir, iterasi, x0, y0, memory_budget, output_format, salt): p
+                   for p in paths}
+        for future in as_completed(futures):
+            result = {"input": futures[future], "output": None, "seconds": 0.0, "bytes": 0, "error": None}
+            try:
+                result["output"], result["seconds"], result["bytes"] = future.result()
+            except Exception as e:
+                result["error"] = str(e)
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return results
+
+
+def _print_result(result):
+    name = os.path.basename(result["input"])
+    if result["error"]:
+        print(f"GAGAL  {name}: {result['error']}")
+    else:
+        print(f"OK     {name} -> {os.path.basename(result['output'])} ({result['seconds']:.2f} detik)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enkripsi/dekripsi citra ACM + Duffing Map secara batch.")
+    parser.add_argument("mode", choices=("encrypt", "decrypt"))
+    parser.add_argument("input", help="Direktori input atau pola glob (mis. 'data/*.png')")
+    parser.add_argument("-o", "--output", required=True, help="Direktori output")
+    parser.add_argument("--iterasi", type=int, default=10, help="Iterasi ACM (default: 10)")
+    parser.add_argument("-a", "--x0", type=float, default=0.1, help="Kunci a / x0 Duffing (default: 0.1)")
+    parser.add_argument("-b", "--y0", type=float, default=0.1, help="Kunci b / y0 Duffing (default: 0.1)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Jumlah worker proses (default: jumlah CPU)")
+    parser.add_argument("--low-memory", type=int, metavar="MB", default=None,
+                        help="Mode hemat memori dengan batas memori kerja per worker dalam MB")
+    parser.add_argument("--perf-log", metavar="PATH", default=None,
+                        help="Tambahkan durasi per tahap setiap file ke log JSON Lines ini")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Proses berurutan dalam satu proses dengan tahap keystream/dekode/simpan yang tumpang tindih")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="png",
+                        help="Format ciphertext hasil enkripsi: png (bawaan) atau acm (kontainer mentah, tanpa kompresi)")
+    args = parser.parse_args(argv)
+    if args.pipeline and args.low_memory is not None:
+        parser.error("--pipeline tidak bisa digabung dengan --low-memory (pipeline memproses citra utuh di memori)")
+    if args.pipeline and args.workers is not None:
+        parser.error("--pipeline berjalan dalam satu proses; -j/--workers tidak berlaku")
+
+    extensions = IMAGE_EXTENSIONS + (CONTAINER_EXTENSION,) if args.mode == "decrypt" else IMAGE_EXTENSIONS
+    paths = collect_inputs(args.input, extensions)
+    if not paths:
+        print(f"Tidak ada file citra ditemukan di {args.input}", file=sys.stderr)
+        return 1
+    memory_budget = args.low_memory * 1024 * 1024 if args.low_memory else None
+    try:
+        check_output_names(args.mode, paths, memory_budget, args.format)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.perf_log:
+        # Lewat variabel lingkungan agar ikut terbaca di worker proses
+        os.environ["ACM_PERF_LOG"] = os.path.abspath(args.perf_log)
+        perf_log.configure(os.environ["ACM_PERF_LOG"])
+
+    start_time = time.perf_counter()
+    if args.pipeline:
+        pipeline = CipherPipeline(args.mode, args.output, args.iterasi, args.x0, args.y0,
+                                  output_format=args.format)
+        results = pipeline.run(paths, on_result=_print_result)
+    else:
+        results = run_batch(args.mode, paths, args.output, args.iterasi, args.x0, args.y0,
+                            workers=args.workers, on_result=_print_result,
+                            memory_budget=memory_budget,
+                            output_format=args.format)
+    elapsed_time = time.perf_counter() - start_time
+
+    done = [r for r in results if not r["error"]]
+    total_mb = sum(r["bytes"] for r in done) / (1024 * 1024)
+    print(f"\n{len(done)}/{len(results)} file selesai dalam {elapsed_time:.2f} detik "
+          f"({len(done) / elapsed_time:.2f} file/detik, {total_mb / elapsed_time:.2f} MB/detik)")
+    return 0 if len(done) == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
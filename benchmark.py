@@ -0,0 +1,259 @@
+"""
+Benchmark yang dapat direproduksi untuk pipeline cipher (tanpa GUI Tkinter).
+
+Mengukur ACM, invers ACM, keystream Duffing, statistik (entropi dan
+korelasi) serta enkripsi/dekripsi end-to-end pada citra sintetis untuk
+grid ukuran, mode (L/RGB) dan jumlah iterasi. Melaporkan throughput
+(MB/detik) dan puncak memori, lalu membandingkannya dengan baseline
+JSON; regresi di atas ambang membuat proses keluar dengan kode 1.
+
+Dengan `--startup` yang diukur adalah biaya impor modul dan cold start
+GUI, masing-masing di proses Python baru.
+
+Contoh:
+    python benchmark.py --sizes 256 512 1024 --save-baseline baseline.json
+    python benchmark.py --sizes 256 512 1024 --baseline baseline.json --threshold 0.25
+    python benchmark.py --startup --repeat 5
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import subprocess
+import platform
+import tempfile
+import statistics
+import tracemalloc
+import numpy as np
+from PIL import Image
+
+import permutation
+import keystream
+import perf_log
+from permutation import arnold_cat_map, inverse_arnold_cat_map
+from keystream import generate_keystream_duffing_map
+from image_stats import calculate_entropy, adjacent_correlation, npcr_uaci
+from cipher import encrypt_file, decrypt_file
+
+DEFAULT_SIZES = (256, 512, 1024, 2048, 4096)
+DEFAULT_MODES = ("L", "RGB")
+DEFAULT_ITERATIONS = (1, 10)
+KEY = (0.1, 0.1)
+
+STARTUP_CASES = (
+    ("import_cipher", "import cipher"),
+    ("import_image_stats", "import image_stats"),
+    ("import_gui_module", "import aplikasi_enkripsi"),
+    ("import_matplotlib_tkagg", "import matplotlib.figure, matplotlib.backends.backend_tkagg"),
+    ("gui_cold_start", "import aplikasi_enkripsi\napp = aplikasi_enkripsi.CryptoApp()\napp.update()\napp.destroy()"),
+)
+# Modul inti (cipher, statistik) harus bisa diimpor tanpa modul GUI ini
+HEAVY_MODULES = ("tkinter", "matplotlib", "PIL.ImageTk")
+_STARTUP_PROBE = """
+import sys, json, time
+start = time.perf_counter()
+exec(compile({code!r}, "<startup>", "exec"))
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "heavy_modules": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def synthetic_image(size, mode, seed=0):
+    """Citra sintetis deterministik: gradien halus ditambah derau, agar mirip foto."""
+    rng = np.random.default_rng(seed + size)
+    ramp = np.add.outer(np.arange(size), np.arange(size)) * (255.0 / max(1, 2 * size - 2))
+    channels = 1 if mode == "L" else 3
+    arr = ramp[:, :, None] + rng.normal(0, 12, (size, size, channels))
+    arr = np.clip(arr, 0, 255).astype(np.uint8)
+    return arr[:, :, 0] if mode == "L" else arr
+
+
+def clear_caches():
+    """Mengosongkan cache permutasi dan keystream agar setiap pengukuran dimulai dingin."""
+    permutation.default_cache.clear()
+    keystream.default_cache.clear()
+
+
+def _measure(func, repeat, trace_memory):
+    """Menjalankan `func` (setelah cache dikosongkan) dan mengembalikan (median detik, puncak byte)."""
+    durations = []
+    for _ in range(repeat):
+        clear_caches()
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    peak_bytes = None
+    if trace_memory:
+        clear_caches()
+        tracemalloc.start()
+        try:
+            func()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return statistics.median(durations), peak_bytes
+
+
+def build_cases(sizes, modes, iterations, work_dir):
+    """Daftar kasus benchmark: (nama, ukuran, mode, iterasi, fungsi, byte_citra)."""
+    cases = []
+    for size in sizes:
+        for mode in modes:
+            arr = synthetic_image(size, mode)
+            nbytes = arr.nbytes
+            channels = 1 if mode == "L" else 3
+            src_path = os.path.join(work_dir, f"synthetic_{size}_{mode}.png")
+            Image.fromarray(arr, mode=mode).save(src_path)
+            cases.append(("keystream", size, mode, None,
+                          lambda s=size, c=channels: generate_keystream_duffing_map(s, *KEY, channels=c), nbytes))
+            cases.append(("entropy", size, mode, None, lambda a=arr: calculate_entropy(a), nbytes))
+            cases.append(("correlation", size, mode, None, lambda a=arr: adjacent_correlation(a), nbytes))
+            cases.append(("npcr_uaci", size, mode, None, lambda a=arr, b=255 - arr: npcr_uaci(a, b), nbytes))
+            for iterasi in iterations:
+                out_dir = os.path.join(work_dir, f"out_{size}_{mode}_{iterasi}")
+                os.makedirs(out_dir, exist_ok=True)
+                enc_path = os.path.join(out_dir, os.path.basename(src_path).replace("synthetic", "Encrypted_synthetic"))
+                cases.append(("acm", size, mode, iterasi, lambda a=arr, k=iterasi: arnold_cat_map(a, k), nbytes))
+                cases.append(("inverse_acm", size, mode, iterasi, lambda a=arr, k=iterasi: inverse_arnold_cat_map(a, k), nbytes))
+                cases.append(("encrypt", size, mode, iterasi,
+                              lambda p=src_path, o=out_dir, k=iterasi: encrypt_file(p, o, k, *KEY), nbytes))
+                cases.append(("decrypt", size, mode, iterasi,
+                              lambda p=enc_path, o=out_dir, k=iterasi: decrypt_file(p, o, k, *KEY), nbytes))
+    return cases
+
+
+def case_key(name, size, mode, iterasi):
+    return f"{name}|{size}|{mode}|{iterasi if iterasi is not None else '-'}"
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, modes=DEFAULT_MODES, iterations=DEFAULT_ITERATIONS, repeat=3,
+                   trace_memory=True, on_result=None):
+    """Menjalankan seluruh grid dan mengembalikan dict hasil per kunci kasus."""
+    results = {}
+    # Log performa per file dimatikan agar penulisan log tidak ikut terukur
+    log_path = perf_log.get_log_path()
+    perf_log.configure(None)
+    work_dir = tempfile.mkdtemp(prefix="acm_bench_")
+    try:
+        for name, size, mode, iterasi, func, nbytes in build_cases(sizes, modes, iterations, work_dir):
+            seconds, peak_bytes = _measure(func, repeat, trace_memory)
+            result = {"name": name, "size": size, "mode": mode, "iterations": iterasi, "seconds": seconds,
+                      "mb_per_s": nbytes / (1024 * 1024) / seconds if seconds > 0 else None,
+                      "peak_bytes": peak_bytes}
+            results[case_key(name, size, mode, iterasi)] = result
+            if on_result:
+                on_result(result)
+    finally:
+        perf_log.configure(log_path)
+        clear_caches()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def _run_startup_probe(code):
+    """Menjalankan `code` di interpreter baru; mengembalikan (hasil probe, durasi proses) atau pesan error."""
+    script = _STARTUP_PROBE.format(code=code, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(os.path.abspath(__file__)),
+                          capture_output=True, text=True)
+    process_seconds = time.perf_counter() - start
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return None, lines[-1] if lines else f"kode keluar {proc.returncode}"
+    return json.loads(proc.stdout.strip().splitlines()[-1]), process_seconds
+
+
+def run_startup_benchmarks(repeat=5, on_result=None):
+    """Biaya impor dan cold start GUI (median dari `repeat` proses baru); kasus yang gagal (mis. tanpa display) dilewati."""
+    results = {}
+    for name, code in STARTUP_CASES:
+        samples, process_samples, error = [], [], None
+        for _ in range(repeat):
+            probe, process_seconds = _run_startup_probe(code)
+            if probe is None:
+                error = process_seconds
+                break
+            samples.append(probe["seconds"]); process_samples.append(process_seconds)
+        result = {"name": name, "seconds": statistics.median(samples) if samples else None,
+                  "process_seconds": statistics.median(process_samples) if process_samples else None,
+                  "heavy_modules": probe["heavy_modules"] if samples else None, "error": error}
+        if error is None:
+            results["startup|" + name] = result
+        if on_result:
+            on_result(result)
+    return results
+
+
+def _print_startup_result(result):
+    if result["error"]:
+        print(f"{result['name']:<24} dilewati: {result['error']}")
+        return
+    heavy = ", ".join(result["heavy_modules"]) or "-"
+    print(f"{result['name']:<24} {result['seconds']:8.3f} s  (proses {result['process_seconds']:.3f} s)  modul GUI: {heavy}")
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """Daftar regresi: kasus yang lebih lambat dari baseline lebih dari `threshold` (fraksi)."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get("results", {}).get(key)
+        if base and base["seconds"] > 0 and result["seconds"] > base["seconds"] * (1 + threshold):
+            regressions.append((key, base["seconds"], result["seconds"]))
+    return regressions
+
+
+def _print_result(result):
+    iterasi = result["iterations"] if result["iterations"] is not None else "-"
+    peak = f"{result['peak_bytes'] / (1024 * 1024):8.1f} MB" if result["peak_bytes"] is not None else "       -   "
+    mbps = f"{result['mb_per_s']:9.1f}" if result["mb_per_s"] is not None else "        -"
+    print(f"{result['name']:<12} {result['size']:>5} {result['mode']:<3} {iterasi!s:>5} "
+          f"{result['seconds']:9.4f} s {mbps} MB/s {peak}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline cipher ACM + Duffing Map.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--modes", nargs="+", choices=DEFAULT_MODES, default=list(DEFAULT_MODES))
+    parser.add_argument("--iterations", type=int, nargs="+", default=list(DEFAULT_ITERATIONS))
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengulangan per kasus (median dilaporkan)")
+    parser.add_argument("--no-memory", action="store_true", help="Lewati pengukuran puncak memori (tracemalloc)")
+    parser.add_argument("--baseline", help="File baseline JSON untuk pembanding")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Ambang regresi relatif (default: 0.20 = 20%%)")
+    parser.add_argument("--save-baseline", help="Simpan hasil run ini sebagai baseline JSON")
+    parser.add_argument("--startup", action="store_true", help="Ukur biaya impor dan cold start GUI, bukan grid cipher")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        results = run_startup_benchmarks(args.repeat, on_result=_print_startup_result)
+        core = results.get("startup|import_cipher")
+        if core and core["heavy_modules"]:
+            print(f"\nGAGAL: 'import cipher' ikut memuat {', '.join(core['heavy_modules'])}")
+            return 1
+    else:
+        print(f"{'benchmark':<12} {'size':>5} {'mode':<3} {'iter':>5} {'median':>11} {'throughput':>14} {'peak':>11}")
+        results = run_benchmarks(args.sizes, args.modes, args.iterations, args.repeat,
+                                 trace_memory=not args.no_memory, on_result=_print_result)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+                       "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}, f, indent=2)
+        print(f"\nBaseline disimpan ke {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nREGRESI (> {args.threshold:.0%} lebih lambat dari baseline):")
+            for key, base_seconds, seconds in regressions:
+                print(f"  {key}: {base_seconds:.4f} s -> {seconds:.4f} s ({seconds / base_seconds - 1:+.0%})")
+            return 1
+        print(f"\nTidak ada regresi di atas {args.threshold:.0%} dibanding baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
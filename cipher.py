@@ -0,0 +1,182 @@
+"""
+Jalur enkripsi/dekripsi citra yang dipakai bersama oleh GUI dan mode batch.
+
+Enkripsi: permutasi ACM lalu difusi XOR dengan keystream Duffing Map.
+Dekripsi: XOR dengan keystream yang sama lalu invers ACM.
+
+Ciphertext disimpan sebagai PNG (bawaan) atau kontainer mentah .acm
+(`output_format="acm"`, lihat modul `container`).
+"""
+import io
+import os
+import numpy as np
+from PIL import Image
+
+from permutation import arnold_cat_map, inverse_arnold_cat_map
+from keystream import generate_keystream_duffing_map
+from perf_log import StageTimer, write_record
+from container import EXTENSION as CONTAINER_EXTENSION, write_container, is_container, load_container, check_key
+import preview
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+OUTPUT_FORMATS = ("png", "acm")
+
+
+def _report(progress, stage, fraction=None):
+    """Meneruskan progres tahap ke callback `progress(tahap, fraksi)` bila ada."""
+    if progress:
+        progress(stage, fraction)
+
+
+def load_image_for_encryption(fpath, progress=None):
+    """Membuka citra sebagai array L/RGB dengan ukuran asli (tanpa resize)."""
+    _report(progress, "Dekode citra")
+    img = Image.open(fpath)
+    img.load()
+    return prepare_image(img, progress)
+
+
+def prepare_image(img, progress=None):
+    """Mengubah PIL Image (mis. satu frame) menjadi array L/RGB; mengembalikan (array, mode).
+
+    Citra tidak persegi dienkripsi apa adanya (lihat `permutation.acm_windows`),
+    sehingga dekripsi mengembalikan citra asli tanpa kehilangan data.
+    """
+    original_mode = img.mode
+    if original_mode not in ['L', 'RGB']:
+        _report(progress, "Konversi RGB")
+        img = img.convert('RGB')
+        original_mode = 'RGB'
+    return np.array(img), original_mode
+
+
+def encrypt_array(arr, iterasi, x0, y0, progress=None):
+    """Mengenkripsi array citra h x w: ACM lalu XOR dengan keystream Duffing."""
+    channels = 1 if arr.ndim == 2 else 3
+    _report(progress, "Permutasi ACM")
+    permuted_arr = arnold_cat_map(arr, iterasi)
+    _report(progress, "Keystream Duffing")
+    keystream = generate_keystream_duffing_map(permuted_arr.shape[0], x0, y0, channels=channels, progress=progress,
+                                               width=permuted_arr.shape[1])
+    _report(progress, "Difusi XOR")
+    return np.bitwise_xor(permuted_arr, keystream)
+
+
+def decrypt_array(arr, iterasi, x0, y0, progress=None):
+    """Mendekripsi array citra h x w: XOR dengan keystream Duffing lalu invers ACM."""
+    channels = 1 if arr.ndim == 2 else 3
+    _report(progress, "Keystream Duffing")
+    keystream = generate_keystream_duffing_map(arr.shape[0], x0, y0, channels=channels, progress=progress,
+                                               width=arr.shape[1])
+    _report(progress, "Difusi XOR")
+    undiffused_arr = np.bitwise_xor(arr, keystream)
+    _report(progress, "Invers ACM")
+    return inverse_arnold_cat_map(undiffused_arr, iterasi)
+
+
+def encrypted_filename(fpath, output_format="png"):
+    """Nama file hasil enkripsi: Encrypted_<nama>.png (atau .acm untuk kontainer)"""
+    name, _ = os.path.splitext(os.path.basename(fpath))
+    return "Encrypted_" + name + (CONTAINER_EXTENSION if output_format == "acm" else ".png")
+
+
+def decrypted_filename(fpath):
+    """Nama file hasil dekripsi: awalan Encrypted_ diganti Decrypted_ (kontainer .acm menjadi .png)."""
+    base = os.path.basename(fpath)
+    name, ext = os.path.splitext(base)
+    if ext.lower() == CONTAINER_EXTENSION:
+        base = name + ".png"
+    return "Decrypted_" + base[10:] if base.startswith("Encrypted_") else "Decrypted_" + base
+
+
+def check_output_format(output_format):
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Format output tidak dikenal: {output_format} (pilih {', '.join(OUTPUT_FORMATS)})")
+
+
+def _encode_and_write(img, saved_path, progress, format=None):
+    """Encode citra ke memori lalu menulisnya ke disk, sebagai dua tahap terpisah."""
+    if format is None:
+        format = Image.registered_extensions().get(os.path.splitext(saved_path)[1].lower())
+    _report(progress, "Encode " + (format or "citra"))
+    if format is None:
+        # Ekstensi tidak dikenal: biarkan Pillow yang menentukan (dan melaporkan error)
+        img.save(saved_path)
+        return
+    buffer = io.BytesIO()
+    img.save(buffer, format=format)
+    _report(progress, "Tulis ke disk")
+    with open(saved_path, 'wb') as f:
+        f.write(buffer.getbuffer())
+
+
+def _timed(operation, fpath, progress, timer):
+    """Timer untuk satu operasi file; dibuat baru (dan dicatat ke log) jika pemanggil tidak memberi."""
+    own_timer = timer is None
+    if own_timer:
+        timer = StageTimer(operation, file=os.path.basename(fpath))
+    return timer, timer.chain(progress), own_timer
+
+
+def _store_preview(saved_path, arr, mode, preview_box, progress):
+    """Thumbnail hasil langsung dari array di memori, agar GUI tidak mendekode ulang file output."""
+    if preview_box:
+        _report(progress, "Thumbnail")
+        preview.default_cache.put_array(saved_path, arr, preview_box, mode)
+
+
+def encrypt_file(fpath, output_dir, iterasi, x0, y0, progress=None, timer=None, output_format="png", preview_box=None,
+                 salt=None):
+    """Mengenkripsi satu file citra ke `output_dir`; mengembalikan path hasil.
+
+    `progress(tahap, fraksi)` (opsional) dipanggil di setiap tahap. Durasi
+    tahap dicatat ke `timer` (perf_log.StageTimer); jika tidak diberikan,
+    timer dibuat sendiri dan dicatat ke log performa saat selesai.
+    `output_format` "png" (bawaan) atau "acm" untuk kontainer mentah, dengan `salt` opsional
+    (lihat `container.new_salt`).
+    `preview_box` (mis. (350, 350)) menyimpan thumbnail hasil ke `preview.default_cache`.
+    """
+    check_output_format(output_format)
+    timer, progress, own_timer = _timed("encrypt", fpath, progress, timer)
+    arr, original_mode = load_image_for_encryption(fpath, progress=progress)
+    timer.context.update(width=arr.shape[1], height=arr.shape[0], mode=original_mode, iterasi=iterasi)
+    final_arr = encrypt_array(arr, iterasi, x0, y0, progress=progress)
+    saved_path = os.path.join(output_dir, encrypted_filename(fpath, output_format))
+    if output_format == "acm":
+        _report(progress, "Tulis kontainer")
+        write_container(saved_path, final_arr, iterasi, x0, y0, salt)
+    else:
+        encrypted_img = Image.fromarray(final_arr.astype('uint8'), mode=original_mode)
+        _encode_and_write(encrypted_img, saved_path, progress, format='PNG')
+    _store_preview(saved_path, final_arr, original_mode, preview_box, progress)
+    if own_timer:
+        write_record(timer)
+    return saved_path
+
+
+def decrypt_file(fpath, output_dir, iterasi, x0, y0, progress=None, timer=None, preview_box=None):
+    """Mendekripsi satu file citra terenkripsi ke `output_dir`; mengembalikan path hasil.
+
+    `progress`, `timer` dan `preview_box` sama seperti pada `encrypt_file`. Kontainer .acm
+    dikenali dari magic-nya, dipetakan langsung ke memori dan dicek kuncinya.
+    """
+    timer, progress, own_timer = _timed("decrypt", fpath, progress, timer)
+    if is_container(fpath):
+        _report(progress, "Baca kontainer")
+        header, encrypted_arr = load_container(fpath)
+        check_key(header, iterasi, x0, y0)
+        original_mode = header.mode
+    else:
+        _report(progress, "Dekode citra")
+        img = Image.open(fpath)
+        original_mode = img.mode
+        encrypted_arr = np.array(img)
+    timer.context.update(width=encrypted_arr.shape[1], height=encrypted_arr.shape[0], mode=original_mode, iterasi=iterasi)
+    decrypted_arr = decrypt_array(encrypted_arr, iterasi, x0, y0, progress=progress)
+    decrypted_img = Image.fromarray(decrypted_arr.astype('uint8'), mode=original_mode)
+    saved_path = os.path.join(output_dir, decrypted_filename(fpath))
+    _encode_and_write(decrypted_img, saved_path, progress)
+    _store_preview(saved_path, decrypted_arr, original_mode, preview_box, progress)
+    if own_timer:
+        write_record(timer)
+    return saved_path
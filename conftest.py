@@ -0,0 +1,14 @@
+import pytest
+
+from permutation import configure_cache
+from keystream import default_cache as keystream_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    """Setiap uji mulai dengan cache permutasi dan keystream kosong (tanpa tingkat disk)."""
+    configure_cache(cache_dir="")
+    keystream_cache.clear()
+    yield
+    configure_cache(cache_dir="")
+    keystream_cache.clear()
@@ -0,0 +1,243 @@
+"""
+Format kontainer ciphertext mentah (.acm) dengan header yang mendeskripsikan dirinya.
+
+Ciphertext berentropi tinggi praktis tidak bisa dikompresi, sehingga
+encode/dekode PNG hanya membuang waktu CPU. Kontainer ini berisi header
+kecil (64 byte) lalu piksel uint8 mentah berurutan baris, sehingga bisa
+dibaca tanpa salinan lewat `np.memmap`.
+
+Tata letak header (little-endian):
+    magic 'ACMC' | versi | ukuran header | tinggi | mode ('L'/'RGB') |
+    jumlah kanal | iterasi ACM | nilai cek kunci (8 byte) | CRC32 piksel |
+    lebar | salt (16 byte) | iterasi PBKDF2
+
+Nilai cek kunci diturunkan dari (x0, y0) dengan PBKDF2-HMAC-SHA256 dan
+salt acak, sehingga kunci tidak bisa ditebak offline dengan kecepatan
+hash.
+
+Contoh:
+    python container.py info hasil/Encrypted_foto.acm
+    python container.py export hasil/Encrypted_foto.acm -o Encrypted_foto.png
+"""
+import os
+import sys
+import zlib
+import struct
+import hmac
+import hashlib
+import functools
+import argparse
+from collections import namedtuple
+import numpy as np
+from PIL import Image
+
+MAGIC = b'ACMC'
+VERSION = 1
+EXTENSION = ".acm"
+HEADER_SIZE = 64
+CHANNELS = {'L': 1, 'RGB': 3}
+SALT_SIZE = 16
+KDF_ITERATIONS = 200_000
+# Jumlah iterasi PBKDF2 yang diterima dari header; nilai lain ditolak agar header rusak tidak membuat dekripsi menggantung
+ACCEPTED_KDF_ITERATIONS = (KDF_ITERATIONS,)
+_HEADER = struct.Struct('<4sHHI4sB3xI8sII16sI')
+
+ContainerHeader = namedtuple("ContainerHeader",
+                             "version height width mode channels iterations fingerprint checksum salt kdf_iterations")
+
+
+class ContainerError(ValueError):
+    """File kontainer rusak, tidak dikenal, atau tidak cocok dengan kunci."""
+
+
+@functools.lru_cache(maxsize=64)
+def key_check_value(x0, y0, salt, kdf_iterations=KDF_ITERATIONS):
+    """Nilai cek 8 byte dari kunci (x0, y0) dengan PBKDF2-HMAC-SHA256 dan `salt`.
+
+    Sengaja lambat; di-cache per (kunci, salt).
+    """
+    return hashlib.pbkdf2_hmac('sha256', struct.pack('<dd', x0, y0), salt, kdf_iterations, dklen=8)
+
+
+def new_salt():
+    """Salt acak untuk `ContainerWriter`.
+
+    Pemanggil yang menulis banyak kontainer (batch, pipeline, sekuens, sesi GUI)
+    membuat satu salt dan memakainya untuk semua file, sehingga PBKDF2 di
+    `key_check_value` cukup dihitung sekali per proses alih-alih per file.
+    """
+    return os.urandom(SALT_SIZE)
+
+
+def _pack_header(height, width, mode, iterations, fingerprint, checksum, salt):
+    header = _HEADER.pack(MAGIC, VERSION, HEADER_SIZE, height, mode.encode('ascii'), CHANNELS[mode],
+                          iterations, fingerprint, checksum, width, salt, KDF_ITERATIONS)
+    return header.ljust(HEADER_SIZE, b'\0')
+
+
+class ContainerWriter:
+    """Menulis kontainer blok demi blok baris; CRC32 dihitung sambil jalan dan header ditulis saat close.
+
+    `salt` default acak per file; lihat `new_salt` untuk salt bersama.
+    """
+
+    def __init__(self, fpath, height, width, mode, iterasi, x0, y0, salt=None):
+        if mode not in CHANNELS:
+            raise ContainerError(f"Mode kontainer tidak didukung: {mode}")
+        self.height, self.width, self.mode, self.iterasi = height, width, mode, iterasi
+        self.salt = salt or new_salt()
+        self.fingerprint = key_check_value(x0, y0, self.salt)
+        self.row_bytes = width * CHANNELS[mode]
+        self.rows_written = 0
+        self._checksum = 0
+        self._file = open(fpath, 'wb')
+        # Header sementara; checksum baru diketahui setelah semua baris ditulis
+        self._file.write(b'\0' * HEADER_SIZE)
+
+    def write_rows(self, rows):
+        """Menulis blok baris uint8 berbentuk (baris, lebar) atau (baris, lebar, kanal)."""
+        rows = np.ascontiguousarray(rows, dtype=np.uint8)
+        if rows.size % self.row_bytes:
+            raise ContainerError(f"Ukuran blok tidak sesuai lebar baris {self.row_bytes} byte")
+        self._checksum = zlib.crc32(rows, self._checksum)
+        self._file.write(rows.data)
+        self.rows_written += rows.size // self.row_bytes
+
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            if self.rows_written != self.height:
+                raise ContainerError(f"Jumlah baris kontainer tidak lengkap: {self.rows_written}/{self.height}")
+            self._file.seek(0)
+            self._file.write(_pack_header(self.height, self.width, self.mode, self.iterasi, self.fingerprint,
+                                          self._checksum, self.salt))
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self._file is not None:
+            self._file.close()
+            self._file = None
+        else:
+            self.close()
+
+
+def write_container(fpath, arr, iterasi, x0, y0, salt=None):
+    """Menyimpan array ciphertext h x w (L atau RGB) sebagai kontainer .acm."""
+    mode = 'L' if arr.ndim == 2 else 'RGB'
+    if arr.ndim not in (2, 3) or (arr.ndim == 3 and arr.shape[2] != 3):
+        raise ContainerError(f"Bentuk array tidak didukung: {arr.shape}")
+    with ContainerWriter(fpath, arr.shape[0], arr.shape[1], mode, iterasi, x0, y0, salt) as writer:
+        writer.write_rows(arr)
+
+
+def is_container(fpath):
+    """True jika file diawali magic kontainer."""
+    try:
+        with open(fpath, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def read_header(fpath):
+    """Membaca dan memvalidasi header kontainer."""
+    with open(fpath, 'rb') as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < _HEADER.size or raw[:len(MAGIC)] != MAGIC:
+        raise ContainerError(f"Bukan file kontainer {EXTENSION}: {os.path.basename(fpath)}")
+    (magic, version, header_size, height, mode, channels, iterations, fingerprint, checksum, width,
+     salt, kdf_iterations) = _HEADER.unpack_from(raw)
+    if version != VERSION:
+        raise ContainerError(f"Versi kontainer tidak didukung: {version}")
+    if kdf_iterations not in ACCEPTED_KDF_ITERATIONS:
+        raise ContainerError(f"Iterasi PBKDF2 kontainer tidak didukung: {kdf_iterations}")
+    mode = mode.rstrip(b'\0').decode('ascii', 'replace')
+    if CHANNELS.get(mode) != channels:
+        raise ContainerError(f"Mode/kanal kontainer tidak valid: {mode}/{channels}")
+    expected_size = header_size + height * width * channels
+    if os.path.getsize(fpath) != expected_size:
+        raise ContainerError(f"Ukuran file kontainer tidak sesuai header (harus {expected_size} byte)")
+    return ContainerHeader(version, height, width, mode, channels, iterations, fingerprint, checksum, salt, kdf_iterations)
+
+
+def pixel_shape(header):
+    return (header.height, header.width) if header.channels == 1 else (header.height, header.width, header.channels)
+
+
+def load_container(fpath, verify=True, mmap=True):
+    """Memuat kontainer sebagai (header, piksel) tanpa salinan.
+
+    Dengan `mmap=True` piksel berupa `np.memmap` baca-saja; selain itu
+    seluruh file dibaca sekali dan piksel menjadi view `np.frombuffer`.
+    `verify` mencocokkan CRC32 piksel dengan header.
+    """
+    header = read_header(fpath)
+    shape = pixel_shape(header)
+    if mmap:
+        pixels = np.memmap(fpath, dtype=np.uint8, mode='r', offset=HEADER_SIZE, shape=shape)
+    else:
+        with open(fpath, 'rb') as f:
+            data = f.read()
+        pixels = np.frombuffer(data, dtype=np.uint8, offset=HEADER_SIZE).reshape(shape)
+    if verify and zlib.crc32(pixels) != header.checksum:
+        raise ContainerError(f"Checksum kontainer tidak cocok, file rusak: {os.path.basename(fpath)}")
+    return header, pixels
+
+
+def check_key(header, iterasi, x0, y0):
+    """Melempar `ContainerError` jika kunci atau iterasi tidak cocok dengan yang tercatat di header."""
+    expected = key_check_value(x0, y0, header.salt, header.kdf_iterations)
+    if not hmac.compare_digest(header.fingerprint, expected):
+        raise ContainerError("Kunci (a, b) tidak cocok dengan kunci yang dipakai saat enkripsi.")
+    if header.iterations != iterasi:
+        raise ContainerError(f"Iterasi ACM tidak cocok (kontainer: {header.iterations}, input: {iterasi}).")
+
+
+def open_as_image(fpath):
+    """Membuka citra biasa atau kontainer .acm sebagai PIL Image (mis. untuk pratinjau)."""
+    if is_container(fpath):
+        header, pixels = load_container(fpath, verify=False)
+        return Image.fromarray(np.asarray(pixels), mode=header.mode)
+    return Image.open(fpath)
+
+
+def export_png(fpath, png_path=None):
+    """Menyalin piksel kontainer ke PNG biasa agar bisa dibuka aplikasi lain; mengembalikan path PNG."""
+    header, pixels = load_container(fpath)
+    if png_path is None:
+        png_path = os.path.splitext(fpath)[0] + ".png"
+    Image.fromarray(np.asarray(pixels), mode=header.mode).save(png_path, format='PNG')
+    return png_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=f"Utilitas kontainer ciphertext {EXTENSION}.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="Tampilkan isi header dan verifikasi checksum")
+    info.add_argument("input")
+    export = sub.add_parser("export", help="Ekspor piksel kontainer ke PNG")
+    export.add_argument("input")
+    export.add_argument("-o", "--output", default=None, help="Path PNG (default: nama sama, ekstensi .png)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "info":
+            header, _ = load_container(args.input)
+            print(f"{os.path.basename(args.input)}: versi {header.version}, {header.width}x{header.height} {header.mode}, "
+                  f"iterasi {header.iterations}, cek kunci {header.fingerprint.hex()} (PBKDF2 {header.kdf_iterations}x), CRC32 {header.checksum:08x} (OK)")
+        else:
+            print(export_png(args.input, args.output))
+    except (OSError, ContainerError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Mesin statistik citra tervektorisasi: histogram, entropi, korelasi piksel
+bertetangga, NPCR dan UACI.
+
+Dipakai bersama oleh `AnalysisPage.perform_analysis` dan laporan batch:
+    python image_stats.py hasil/ --csv laporan.csv
+"""
+import os
+import sys
+import csv
+import math
+import argparse
+import numpy as np
+
+from container import EXTENSION as CONTAINER_EXTENSION, open_as_image
+
+DIRECTIONS = ("horizontal", "vertical", "diagonal")
+
+
+def _channels(image_array):
+    """Daftar kanal 2D yang dianalisis (grayscale: 1 kanal, berwarna: 3 kanal pertama)."""
+    if image_array.ndim == 2:
+        return [image_array]
+    return [image_array[:, :, i] for i in range(min(3, image_array.shape[2]))]
+
+
+def channel_histograms(image_array):
+    """Histogram 256-bin per kanal, berbentuk (kanal, 256), dengan satu kali `bincount`."""
+    channels = _channels(image_array)
+    if image_array.ndim == 2:
+        values = image_array.ravel()
+    else:
+        # Geser nilai tiap kanal sebesar 256 * indeks kanal agar satu bincount cukup
+        offsets = np.arange(len(channels), dtype=np.uint16) * 256
+        values = (image_array[:, :, :len(channels)].astype(np.uint16) + offsets).ravel()
+    counts = np.bincount(values, minlength=256 * len(channels))
+    return counts[:256 * len(channels)].reshape(len(channels), 256)
+
+
+def entropy_from_histograms(histograms):
+    """Rata-rata entropi Shannon per kanal dari histogram (kanal, 256)."""
+    entropies = []
+    for counts in histograms:
+        total_pixels = counts.sum()
+        if total_pixels == 0: continue
+        probabilities = counts[counts > 0] / total_pixels
+        entropies.append(-np.sum(probabilities * np.log2(probabilities)))
+    return float(np.mean(entropies)) if entropies else 0.0
+
+
+def calculate_entropy(image_array):
+    """Entropi citra (rata-rata per kanal); target citra terenkripsi ~8.0."""
+    return entropy_from_histograms(channel_histograms(image_array))
+
+
+def _pearson(x, y, chunk_rows=1024):
+    """Koefisien korelasi Pearson dua array 2D uint8 berukuran sama, diakumulasi per blok baris."""
+    n = x.size
+    if n < 2:
+        return 0.0
+    sum_x = sum_y = sum_xx = sum_yy = sum_xy = 0
+    for start in range(0, x.shape[0], chunk_rows):
+        xs = x[start:start + chunk_rows].ravel().astype(np.float64)
+        ys = y[start:start + chunk_rows].ravel().astype(np.float64)
+        # Semua jumlah berupa bilangan bulat < 2**53, sehingga eksak dalam float64
+        sum_x += int(xs.sum()); sum_y += int(ys.sum())
+        sum_xx += int(np.dot(xs, xs)); sum_yy += int(np.dot(ys, ys)); sum_xy += int(np.dot(xs, ys))
+    cov = n * sum_xy - sum_x * sum_y
+    var_x = n * sum_xx - sum_x * sum_x
+    var_y = n * sum_yy - sum_y * sum_y
+    if var_x == 0 or var_y == 0:
+        return float('nan')
+    return cov / math.sqrt(var_x * var_y)
+
+
+def adjacent_pairs(channel, direction):
+    """Pasangan piksel bertetangga (x, y) sebagai dua view hasil slicing."""
+    if direction == "horizontal":
+        return channel[:, :-1], channel[:, 1:]
+    if direction == "vertical":
+        return channel[:-1, :], channel[1:, :]
+    if direction == "diagonal":
+        return channel[:-1, :-1], channel[1:, 1:]
+    raise ValueError(f"Arah tidak dikenal: {direction}")
+
+
+def adjacent_correlation(image_array, sample_size=None, seed=0):
+    """Korelasi piksel bertetangga per kanal, berbentuk (kanal, 3) untuk horizontal/vertikal/diagonal.
+
+    Secara bawaan memakai semua pasangan piksel. Untuk citra sangat besar,
+    `sample_size` memilih sejumlah koordinat acak dengan generator ber-`seed`
+    sehingga hasilnya tetap dapat direproduksi.
+    """
+    channels = _channels(image_array)
+    h, w = channels[0].shape
+    result = np.full((len(channels), len(DIRECTIONS)), np.nan)
+    if h < 2 or w < 2:
+        return result
+    if sample_size is not None and sample_size < (h - 1) * (w - 1):
+        rng = np.random.default_rng(seed)
+        ys = rng.integers(0, h - 1, size=sample_size)
+        xs = rng.integers(0, w - 1, size=sample_size)
+        neighbours = {"horizontal": (ys, xs + 1), "vertical": (ys + 1, xs), "diagonal": (ys + 1, xs + 1)}
+        for c, channel in enumerate(channels):
+            base = channel[ys, xs][None, :]
+            for d, direction in enumerate(DIRECTIONS):
+                result[c, d] = _pearson(base, channel[neighbours[direction]][None, :])
+        return result
+    for c, channel in enumerate(channels):
+        for d, direction in enumerate(DIRECTIONS):
+            result[c, d] = _pearson(*adjacent_pairs(channel, direction))
+    return result
+
+
+def adjacent_pair_sample(image_array, direction="horizontal", max_points=5000, seed=0):
+    """Sampel pasangan piksel bertetangga (x, y) dari kanal pertama untuk plot scatter.
+
+    Citra besar dicuplik acak (maksimal `max_points` pasangan) dengan `seed`
+    tetap, sehingga plot bisa digambar cepat dan dapat direproduksi.
+    """
+    x, y = adjacent_pairs(_channels(image_array)[0], direction)
+    if x.size <= max_points:
+        return x.ravel().copy(), y.ravel().copy()
+    rng = np.random.default_rng(seed)
+    idx = rng.choice(x.size, size=max_points, replace=False)
+    rows, cols = np.divmod(idx, x.shape[1])
+    return x[rows, cols], y[rows, cols]
+
+
+def calculate_pixel_correlation(image_array, sample_size=None, seed=0):
+    """Korelasi (horizontal, vertikal, diagonal), dirata-ratakan antar kanal."""
+    return tuple(float(v) for v in adjacent_correlation(image_array, sample_size, seed).mean(axis=0))
+
+
+def npcr_uaci(cipher_a, cipher_b):
+    """NPCR dan UACI (dalam persen) antara dua citra berukuran sama."""
+    if cipher_a.shape != cipher_b.shape:
+        raise ValueError(f"Ukuran citra berbeda: {cipher_a.shape} vs {cipher_b.shape}")
+    npcr = np.count_nonzero(cipher_a != cipher_b) / cipher_a.size * 100
+    diff = np.abs(cipher_a.astype(np.int16) - cipher_b.astype(np.int16))
+    uaci = diff.sum(dtype=np.int64) / (cipher_a.size * 255) * 100
+    return float(npcr), float(uaci)
+
+
+def analyze_image(image_array, sample_size=None, seed=0):
+    """Ringkasan statistik satu citra: histogram, entropi dan korelasi per kanal."""
+    histograms = channel_histograms(image_array)
+    return {
+        "histograms": histograms,
+        "entropy": entropy_from_histograms(histograms),
+        "correlation": adjacent_correlation(image_array, sample_size, seed),
+    }
+
+
+def analyze_file(fpath, sample_size=None, seed=0):
+    """Seperti `analyze_image`, ditambah nama file, dimensi dan ukuran file (citra biasa atau kontainer .acm)."""
+    with open_as_image(fpath) as img:
+        arr = np.array(img)
+        width, height = img.size
+    report = analyze_image(arr, sample_size, seed)
+    report.update({"file": os.path.basename(fpath), "width": width, "height": height,
+                   "size_bytes": os.path.getsize(fpath)})
+    return report
+
+
+def main(argv=None):
+    from batch import collect_inputs
+    from cipher import IMAGE_EXTENSIONS
+
+    parser = argparse.ArgumentParser(description="Laporan statistik (entropi dan korelasi) untuk banyak citra.")
+    parser.add_argument("input", help="Direktori input atau pola glob")
+    parser.add_argument("--csv", help="Simpan laporan ke file CSV")
+    parser.add_argument("--sample", type=int, default=None, help="Jumlah pasangan piksel acak (default: semua)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed sampling (default: 0)")
+    args = parser.parse_args(argv)
+
+    paths = collect_inputs(args.input, IMAGE_EXTENSIONS + (CONTAINER_EXTENSION,))
+    if not paths:
+        print(f"Tidak ada file citra ditemukan di {args.input}", file=sys.stderr)
+        return 1
+    fieldnames = ["file", "width", "height", "size_bytes", "entropy"] + [f"corr_{d}" for d in DIRECTIONS]
+    rows = []
+    for fpath in paths:
+        report = analyze_file(fpath, args.sample, args.seed)
+        mean_corr = report["correlation"].mean(axis=0)
+        row = {k: report[k] for k in fieldnames[:5]}
+        row.update({f"corr_{d}": float(v) for d, v in zip(DIRECTIONS, mean_corr)})
+        rows.append(row)
+        print(f"{row['file']:<40} entropi={row['entropy']:.4f}  "
+              + "  ".join(f"{d[0].upper()}={row['corr_' + d]:.4f}" for d in DIRECTIONS))
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Job runner latar belakang untuk GUI Tkinter.
+
+Pekerjaan berat (enkripsi, dekripsi, analisis) dijalankan berurutan di
+thread worker sehingga jendela tetap responsif. Worker tidak pernah
+menyentuh widget: progres dan hasil dikirim lewat antrian dan diteruskan
+ke callback di thread Tk melalui `after()`. Pembatalan bersifat
+kooperatif: fungsi pekerjaan menerima argumen `progress` yang akan
+melempar `JobCancelled` begitu job dibatalkan.
+"""
+import time
+import queue
+import threading
+
+
+class JobCancelled(Exception):
+    """Dilempar di dalam pekerjaan yang dibatalkan pengguna."""
+
+
+class Job:
+    """Satu pekerjaan dalam antrian `JobRunner`."""
+
+    def __init__(self, func, args, kwargs, label, callbacks):
+        self.func, self.args, self.kwargs = func, args, kwargs
+        self.label = label
+        self.callbacks = callbacks
+        self.start_time = None
+        self.end_time = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def elapsed(self):
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time or time.perf_counter()) - self.start_time
+
+    def cancel(self):
+        self._cancel_event.set()
+
+
+class JobRunner:
+    """Antrian pekerjaan dengan satu thread worker; callback dijalankan di thread Tk."""
+
+    def __init__(self, widget, poll_ms=50):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.current_job = None
+        self._jobs = queue.Queue()
+        self._events = queue.Queue()
+        self._pending = 0
+        self._lock = threading.Lock()
+        threading.Thread(target=self._worker, daemon=True).start()
+        self.widget.after(self.poll_ms, self._poll)
+
+    @property
+    def pending_count(self):
+        """Jumlah job yang belum selesai (termasuk yang sedang berjalan)."""
+        with self._lock:
+            return self._pending
+
+    def submit(self, func, *args, label="", on_progress=None, on_done=None, on_error=None, on_cancel=None, **kwargs):
+        """Menjadwalkan `func(*args, progress=..., **kwargs)` dan mengembalikan objek `Job`.
+
+        on_progress(job, stage, fraction), on_done(job, hasil), on_error(job, exc)
+        dan on_cancel(job) dipanggil di thread Tk.
+        """
+        callbacks = {"progress": on_progress, "done": on_done, "error": on_error, "cancel": on_cancel}
+        job = Job(func, args, kwargs, label, callbacks)
+        with self._lock:
+            self._pending += 1
+        self._jobs.put(job)
+        return job
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            self.current_job = job
+            job.start_time = time.perf_counter()
+
+            def progress(stage, fraction=None, job=job):
+                if job.cancelled:
+                    raise JobCancelled()
+                self._events.put(("progress", job, (stage, fraction)))
+
+            try:
+                if job.cancelled:
+                    raise JobCancelled()
+                result = job.func(*job.args, progress=progress, **job.kwargs)
+                self._events.put(("done", job, (result,)))
+            except JobCancelled:
+                self._events.put(("cancel", job, ()))
+            except Exception as e:
+                self._events.put(("error", job, (e,)))
+            finally:
+                job.end_time = time.perf_counter()
+                self.current_job = None
+                with self._lock:
+                    self._pending -= 1
+
+    def _poll(self):
+        try:
+            while True:
+                kind, job, payload = self._events.get_nowait()
+                callback = job.callbacks.get(kind)
+                if callback:
+                    callback(job, *payload)
+        except queue.Empty:
+            pass
+        self.widget.after(self.poll_ms, self._poll)
@@ -0,0 +1,140 @@
+"""
+Pembangkit keystream Duffing Map.
+
+Keystream hanya bergantung pada kunci (x0, y0) dan panjangnya, sehingga:
+- state setelah 1000 iterasi "warm-up" disimpan per (x0, y0);
+- keystream yang sudah dibangkitkan disimpan di `KeystreamCache` dan
+  permintaan yang lebih pendek (citra lebih kecil atau grayscale) cukup
+  memakai prefiksnya, sedangkan permintaan yang lebih panjang melanjutkan
+  dari state terakhir alih-alih mengulang dari awal.
+Nilai yang dihasilkan identik byte per byte dengan generator lama.
+"""
+import os
+import array
+import functools
+import threading
+from collections import OrderedDict
+import numpy as np
+
+DUFFING_A, DUFFING_B = 2.75, 0.2
+WARMUP_STEPS = 1000
+
+
+def _iterate(x, y, steps):
+    """Menjalankan Duffing Map sebanyak `steps` kali tanpa menghasilkan keystream."""
+    a, b = DUFFING_A, DUFFING_B
+    for _ in range(steps):
+        x, y = y, -b * x + a * y - y**3
+    return x, y
+
+
+def _fill(buffer, x, y, chunk_size=65536, on_chunk=None):
+    """Mengisi `buffer` (uint8, 1D) langsung dengan keystream mulai dari state (x, y).
+
+    `on_chunk(selesai, total)` (opsional) dipanggil setelah setiap blok.
+    """
+    a, b = DUFFING_A, DUFFING_B
+    ys = array.array('d', bytes(8 * min(chunk_size, buffer.size)))
+    for start in range(0, buffer.size, chunk_size):
+        stop = min(start + chunk_size, buffer.size)
+        for i in range(stop - start):
+            x, y = y, -b * x + a * y - y**3
+            ys[i] = y
+        # Kuantisasi int(abs(y) % 1 * 256) dilakukan per blok dengan NumPy
+        chunk = np.frombuffer(ys, dtype=np.float64, count=stop - start)
+        buffer[start:stop] = (np.abs(chunk) % 1 * 256).astype(np.uint8)
+        if on_chunk:
+            on_chunk(stop, buffer.size)
+    return x, y
+
+
+@functools.lru_cache(maxsize=1024)
+def warmup_state(x0, y0):
+    """State (x, y) Duffing Map setelah iterasi "warm-up"."""
+    return _iterate(x0, y0, WARMUP_STEPS)
+
+
+class KeystreamCache:
+    """Cache keystream per (x0, y0) dengan eviksi LRU di bawah batas memori `max_bytes`.
+
+    Tiap entri menyimpan keystream terpanjang yang pernah diminta beserta
+    state Duffing di ujungnya, sehingga bisa dipotong atau diperpanjang.
+    """
+
+    def __init__(self, max_bytes=128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, x0, y0, total_values, on_chunk=None):
+        """Mengembalikan `total_values` byte keystream pertama (read-only) untuk kunci (x0, y0)."""
+        key = (x0, y0)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and entry[0].size >= total_values:
+            return entry[0][:total_values]
+
+        buffer = np.empty(total_values, dtype=np.uint8)
+        if entry is None:
+            start, state = 0, warmup_state(x0, y0)
+        else:
+            # Lanjutkan dari ujung keystream yang sudah ada
+            start, state = entry[0].size, entry[1]
+            buffer[:start] = entry[0]
+        state = _fill(buffer[start:], *state, on_chunk=on_chunk)
+        buffer.flags.writeable = False
+        self._store(key, (buffer, state))
+        return buffer
+
+    def clear(self):
+        """Mengosongkan cache."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _store(self, key, entry):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[0].nbytes
+            if entry[0].nbytes > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.current_bytes += entry[0].nbytes
+            while self.current_bytes > self.max_bytes:
+                _, (old_buffer, _) = self._entries.popitem(last=False)
+                self.current_bytes -= old_buffer.nbytes
+
+
+class KeystreamStream:
+    """Keystream Duffing yang dibaca bertahap per blok tanpa menyimpan seluruh urutan."""
+
+    def __init__(self, x0, y0):
+        self.state = warmup_state(x0, y0)
+        self.position = 0
+
+    def read(self, count):
+        """Mengembalikan `count` byte keystream berikutnya."""
+        buffer = np.empty(count, dtype=np.uint8)
+        self.state = _fill(buffer, *self.state)
+        self.position += count
+        return buffer
+
+
+default_cache = KeystreamCache(
+    max_bytes=int(os.environ.get("KEYSTREAM_CACHE_MAX_MB", "128")) * 1024 * 1024,
+)
+
+
+def generate_keystream_duffing_map(n, x0, y0, channels=3, progress=None, width=None):
+    """Menghasilkan keystream menggunakan Duffing Map untuk citra n x width (default n x n) dan jumlah kanal yang sesuai."""
+    width = n if width is None else width
+    on_chunk = (lambda done, total: progress("Keystream Duffing", done / total)) if progress else None
+    keystream_array = default_cache.get(x0, y0, n * width * channels, on_chunk=on_chunk)
+    if channels == 1:
+        return keystream_array.reshape((n, width))
+    else:
+        return keystream_array.reshape((n, width, channels))
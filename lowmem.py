@@ -0,0 +1,360 @@
+"""
+Mode hemat memori untuk citra sangat besar.
+
+Piksel input di-memory-map: langsung dari file untuk BMP/PPM/TIFF tanpa
+kompresi, atau lewat file sementara yang diisi per blok baris untuk PNG
+non-interlaced. Format yang tidak bisa dibaca per blok (JPEG, PNG
+interlaced) didekode utuh oleh Pillow dan ditolak jika melebihi
+`memory_budget`. Permutasi ACM dihitung per blok baris dari bentuk
+tertutupnya dan dijalankan dalam dua lintasan berurutan lewat file
+sementara (lihat `_permute_blocks`), sehingga citra tidak perlu muat di
+page cache. Keystream dibaca
+bertahap, difusi XOR dilakukan per blok, dan hasilnya ditulis langsung
+ke PNG (atau kontainer .acm) per blok. Memori kerja dibatasi oleh
+`memory_budget`, bukan oleh ukuran citra, dan piksel ciphertext identik dengan jalur in-memory.
+"""
+import os
+import tempfile
+import contextlib
+import numpy as np
+from PIL import Image
+
+from cipher import load_image_for_encryption, encrypted_filename, decrypted_filename, check_output_format
+from container import ContainerWriter, is_container, load_container, check_key
+from permutation import acm_source_coords
+from keystream import KeystreamStream
+from png_stream import PngStreamWriter, PngStreamReader, UnsupportedPngError
+from perf_log import StageTimer, write_record
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+# Perkiraan byte kerja per piksel dalam satu blok permutasi: dua array
+# koordinat int64 beserta sementaranya, piksel hasil gather dan keystream
+_WORK_BYTES_PER_PIXEL = 40
+# Tambahan untuk citra tidak persegi: koordinat multi-jendela memakai dua
+# array int64 sementara dan satu mask (lihat `permutation.acm_source_coords`)
+_WINDOW_BYTES_PER_PIXEL = 17
+# Perkiraan byte per piksel saat membaca PNG per blok: data zlib tertunda,
+# baris terfilter, salinan blok untuk dekoder Pillow (filter Average/Paeth),
+# hasil unfilter dan keystream
+_PNG_READ_BYTES_PER_PIXEL = 24
+
+
+@contextlib.contextmanager
+def _allow_large_images():
+    """Menonaktifkan sementara batas decompression-bomb Pillow untuk scan berukuran besar."""
+    old_limit = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = None
+    try:
+        yield
+    finally:
+        Image.MAX_IMAGE_PIXELS = old_limit
+
+
+def rows_per_block(width, channels, memory_budget, bytes_per_pixel=_WORK_BYTES_PER_PIXEL):
+    """Jumlah baris (selebar `width` piksel) per blok agar memori kerja satu blok tidak melebihi `memory_budget`."""
+    return max(1, memory_budget // (width * (bytes_per_pixel + 2 * channels)))
+
+
+def _map_raw_tiles(fpath, img):
+    """Memory-map piksel langsung dari file jika Pillow melaporkan data mentah tanpa kompresi."""
+    w, h = img.size
+    channels = 1 if img.mode == 'L' else 3
+    allowed_rawmodes = ('L',) if img.mode == 'L' else ('RGB', 'BGR')
+    tiles = list(img.tile)
+    if not tiles:
+        return None
+
+    layout = None
+    for tile in tiles:
+        codec, extents, offset, args = tile
+        if isinstance(args, str):
+            args = (args,)
+        args = tuple(args) + (0, 1)[len(args) - 1:]
+        rawmode, stride, orientation = args[:3]
+        stride = stride or w * channels
+        if codec != 'raw' or extents[0] != 0 or extents[2] != w or rawmode not in allowed_rawmodes:
+            return None
+        if layout is None:
+            layout = (offset - extents[1] * stride, stride, orientation, rawmode)
+        elif orientation != 1 or layout[1:] != (stride, orientation, rawmode) \
+                or offset != layout[0] + extents[1] * stride:
+            # Beberapa strip hanya didukung jika tersusun berurutan di file
+            return None
+
+    base_offset, stride, orientation, rawmode = layout
+    if base_offset < 0 or stride < w * channels or base_offset + h * stride > os.path.getsize(fpath):
+        return None
+    mapped = np.memmap(fpath, dtype=np.uint8, mode='r', offset=base_offset, shape=(h, stride))
+    pixels = mapped[:, :w * channels]
+    if channels == 3:
+        pixels = pixels.reshape(h, w, 3)
+    if orientation == -1:
+        pixels = pixels[::-1]
+    if rawmode == 'BGR':
+        pixels = pixels[..., ::-1]
+    return pixels
+
+
+def _create_memmap(shape, work_dir):
+    fd, temp_path = tempfile.mkstemp(suffix=".raw", dir=work_dir)
+    os.close(fd)
+    return np.memmap(temp_path, dtype=np.uint8, mode='w+', shape=shape), temp_path
+
+
+def _remove_temp(temp_path):
+    if temp_path:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def _stream_png(reader, memory_budget, work_dir):
+    """Menyalin PNG non-interlaced ke memmap sementara blok demi blok lewat `PngStreamReader`."""
+    shape = (reader.height, reader.width) if reader.channels == 1 else (reader.height, reader.width, 3)
+    rows = rows_per_block(reader.width, reader.channels, memory_budget, bytes_per_pixel=_PNG_READ_BYTES_PER_PIXEL)
+    pixels, temp_path = _create_memmap(shape, work_dir)
+    try:
+        row = 0
+        for block in reader.iter_rows(rows):
+            pixels[row:row + block.shape[0]] = block
+            row += block.shape[0]
+        pixels.flush()
+    except BaseException:
+        pixels = None
+        _remove_temp(temp_path)
+        raise
+    return pixels, temp_path
+
+
+def open_pixels(fpath, work_dir=None, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """Membuka citra untuk enkripsi sebagai array yang di-memory-map.
+
+    BMP/PPM/TIFF mentah dipetakan langsung dari file dan PNG non-interlaced
+    L/RGB dibaca per blok. Format lain (JPEG, PNG interlaced atau bermode
+    lain) didekode utuh oleh Pillow, sehingga harus muat dalam `memory_budget`.
+    Mengembalikan (piksel, mode, path_sementara); path_sementara None jika
+    piksel dipetakan langsung dari file input.
+    """
+    try:
+        reader = PngStreamReader(fpath)
+    except UnsupportedPngError:
+        reader = None
+    if reader is not None:
+        with reader:
+            pixels, temp_path = _stream_png(reader, memory_budget, work_dir)
+            return pixels, reader.mode, temp_path
+    with _allow_large_images():
+        img = Image.open(fpath)
+        if img.mode in ('L', 'RGB'):
+            pixels = _map_raw_tiles(fpath, img)
+            if pixels is not None:
+                return pixels, img.mode, None
+        w, h = img.size
+        if w * h * (1 if img.mode == 'L' else 3) > memory_budget:
+            raise ValueError(f"{os.path.basename(fpath)} tidak bisa dibaca per blok dan melebihi anggaran memori; "
+                             f"gunakan PNG non-interlaced atau BMP/PPM/TIFF tanpa kompresi")
+        # Format terkompresi (atau perlu konversi mode): dekode dengan Pillow lalu pindahkan ke disk
+        arr, original_mode = load_image_for_encryption(fpath)
+    pixels, temp_path = _create_memmap(arr.shape, work_dir)
+    pixels[:] = arr
+    del arr
+    pixels.flush()
+    return pixels, original_mode, temp_path
+
+
+def _timed_blocks(timer, name, blocks):
+    """Meneruskan blok dari `blocks` sambil mencatat waktu pengambilan tiap blok ke tahap `name` di `timer`."""
+    blocks = iter(blocks)
+    while True:
+        with timer.stage(name, merge=True):
+            block = next(blocks, None)
+        if block is None:
+            return
+        yield block
+
+
+def _xor_keystream(timer, keystream, block, out):
+    with timer.stage("Keystream Duffing", merge=True):
+        key_block = keystream.read(block.size).reshape(block.shape)
+    with timer.stage("Difusi XOR", merge=True):
+        np.bitwise_xor(block, key_block, out=out)
+
+
+def _work_bytes_per_pixel(h, w):
+    return _WORK_BYTES_PER_PIXEL + (_WINDOW_BYTES_PER_PIXEL if h != w else 0)
+
+
+def _permute_blocks(pixels, iterasi, rows, work_dir, inverse=False):
+    """Menghasilkan blok-blok baris hasil ACM (atau inversnya) dari `pixels` dengan dua lintasan berurutan.
+
+    Gather langsung per blok tujuan mengambil sumber dari seluruh citra, jadi
+    setiap blok membaca hampir semua halaman file secara acak. Di sini
+    lintasan pertama membaca `pixels` blok demi blok dan menyebar setiap
+    piksel ke wilayah blok tujuannya di file sementara; lintasan kedua
+    membaca wilayah itu berurutan dan hanya menata ulang piksel di dalam
+    blok. Di dalam wilayah piksel tersusun menurut indeks sumber, sehingga
+    tidak ada indeks yang perlu disimpan.
+    """
+    h, w = pixels.shape[:2]
+    pixel_shape = pixels.shape[2:]
+    n_blocks = -(-h // rows)
+    buckets, temp_path = _create_memmap((h * w,) + pixel_shape, work_dir)
+    try:
+        cursors = np.arange(n_blocks, dtype=np.int64) * rows * w
+        for row_start in range(0, h, rows):
+            row_stop = min(row_start + rows, h)
+            # Posisi tujuan piksel sumber = koordinat sumber dari arah sebaliknya
+            dst_y, dst_x = acm_source_coords(h, iterasi, row_start, row_stop, inverse=not inverse, width=w)
+            del dst_x
+            dst_block = (dst_y // rows).astype(np.uint16 if n_blocks <= 2**16 else np.int64).ravel()
+            del dst_y
+            order = np.argsort(dst_block, kind='stable')
+            counts = np.bincount(dst_block, minlength=n_blocks)
+            del dst_block
+            values = np.asarray(pixels[row_start:row_stop]).reshape((-1,) + pixel_shape)[order]
+            del order
+            start = 0
+            for b in np.flatnonzero(counts):
+                count = counts[b]
+                buckets[cursors[b]:cursors[b] + count] = values[start:start + count]
+                cursors[b] += count
+                start += count
+            del values
+        for row_start in range(0, h, rows):
+            row_stop = min(row_start + rows, h)
+            src_y, src_x = acm_source_coords(h, iterasi, row_start, row_stop, inverse=inverse, width=w)
+            src_y *= w
+            src_y += src_x
+            del src_x
+            order = np.argsort(src_y.ravel())
+            del src_y
+            block = np.empty(((row_stop - row_start) * w,) + pixel_shape, dtype=np.uint8)
+            block[order] = buckets[row_start * w:row_stop * w]
+            del order
+            yield block.reshape((row_stop - row_start, w) + pixel_shape)
+    finally:
+        buckets = None
+        _remove_temp(temp_path)
+
+
+def encrypt_file_lowmem(fpath, output_dir, iterasi, x0, y0, memory_budget=DEFAULT_MEMORY_BUDGET, work_dir=None,
+                        output_format="png", salt=None, timer=None):
+    """Seperti `cipher.encrypt_file`, tetapi dengan memori kerja dibatasi `memory_budget` byte.
+
+    Tahap-tahap per blok dicatat ke `timer` seperti pada `cipher.encrypt_file`.
+    """
+    check_output_format(output_format)
+    own_timer = timer is None
+    if own_timer:
+        timer = StageTimer("encrypt", file=os.path.basename(fpath), low_memory=True)
+    with timer.stage("Dekode citra"):
+        pixels, mode, temp_path = open_pixels(fpath, work_dir, memory_budget)
+    try:
+        h, w = pixels.shape[:2]
+        timer.context.update(width=w, height=h, mode=mode, iterasi=iterasi)
+        channels = 1 if pixels.ndim == 2 else 3
+        rows = rows_per_block(w, channels, memory_budget, bytes_per_pixel=_work_bytes_per_pixel(h, w))
+        keystream = KeystreamStream(x0, y0)
+        saved_path = os.path.join(output_dir, encrypted_filename(fpath, output_format))
+        if output_format == "acm":
+            writer = ContainerWriter(saved_path, h, w, mode, iterasi, x0, y0, salt)
+        else:
+            writer = PngStreamWriter(saved_path, w, h, mode)
+        write_stage = "Tulis kontainer" if output_format == "acm" else "Encode PNG"
+        with writer, contextlib.closing(_permute_blocks(pixels, iterasi, rows, work_dir)) as blocks:
+            for block in _timed_blocks(timer, "Permutasi ACM", blocks):
+                _xor_keystream(timer, keystream, block, block)
+                with timer.stage(write_stage, merge=True):
+                    writer.write_rows(block)
+    finally:
+        pixels = None
+        _remove_temp(temp_path)
+    if own_timer:
+        write_record(timer)
+    return saved_path
+
+
+def _undiffuse_blocks(blocks, shape, x0, y0, work_dir, timer):
+    """XOR blok-blok ciphertext dengan keystream ke dalam memmap sementara."""
+    undiffused, temp_path = _create_memmap(shape, work_dir)
+    try:
+        keystream = KeystreamStream(x0, y0)
+        row = 0
+        for block in _timed_blocks(timer, "Dekode citra", blocks):
+            _xor_keystream(timer, keystream, block, undiffused[row:row + block.shape[0]])
+            row += block.shape[0]
+        undiffused.flush()
+    except BaseException:
+        undiffused = None
+        _remove_temp(temp_path)
+        raise
+    return undiffused, temp_path
+
+
+def _open_undiffused(fpath, iterasi, x0, y0, memory_budget, work_dir, timer):
+    """Membaca ciphertext per blok (kontainer .acm, PNG streaming, atau Pillow) lalu membatalkan difusi."""
+    if is_container(fpath):
+        with timer.stage("Baca kontainer"):
+            header, pixels = load_container(fpath)
+            check_key(header, iterasi, x0, y0)
+        rows = rows_per_block(header.width, header.channels, memory_budget, bytes_per_pixel=2)
+        blocks = (pixels[r:r + rows] for r in range(0, header.height, rows))
+        undiffused, temp_path = _undiffuse_blocks(blocks, pixels.shape, x0, y0, work_dir, timer)
+        return undiffused, header.mode, temp_path
+    try:
+        reader = PngStreamReader(fpath)
+    except UnsupportedPngError:
+        reader = None
+    if reader is not None:
+        with reader:
+            shape = (reader.height, reader.width) if reader.channels == 1 else (reader.height, reader.width, 3)
+            rows = rows_per_block(reader.width, reader.channels, memory_budget, bytes_per_pixel=_PNG_READ_BYTES_PER_PIXEL)
+            undiffused, temp_path = _undiffuse_blocks(reader.iter_rows(rows), shape, x0, y0, work_dir, timer)
+            return undiffused, reader.mode, temp_path
+    with _allow_large_images():
+        img = Image.open(fpath)
+        if img.mode not in ('L', 'RGB'):
+            raise ValueError(f"Mode citra terenkripsi tidak didukung: {img.mode}")
+        # Format yang tidak bisa dibaca per blok (mis. PNG interlaced, TIFF terkompresi) harus muat utuh dalam anggaran
+        w, h = img.size
+        if w * h * (1 if img.mode == 'L' else 3) > memory_budget:
+            raise ValueError(f"{os.path.basename(fpath)} tidak bisa dibaca per blok dan melebihi anggaran memori; "
+                             f"gunakan PNG non-interlaced atau kontainer .acm")
+        with timer.stage("Dekode citra"):
+            encrypted_arr = np.array(img)
+    h, w = encrypted_arr.shape[:2]
+    rows = rows_per_block(w, 1 if encrypted_arr.ndim == 2 else 3, memory_budget, bytes_per_pixel=2)
+    blocks = (encrypted_arr[r:r + rows] for r in range(0, h, rows))
+    undiffused, temp_path = _undiffuse_blocks(blocks, encrypted_arr.shape, x0, y0, work_dir, timer)
+    return undiffused, img.mode, temp_path
+
+
+def decrypt_file_lowmem(fpath, output_dir, iterasi, x0, y0, memory_budget=DEFAULT_MEMORY_BUDGET, work_dir=None,
+                        timer=None):
+    """Seperti `cipher.decrypt_file`, tetapi dengan memori kerja dibatasi `memory_budget` byte.
+
+    Hasil selalu ditulis sebagai PNG; `timer` sama seperti pada `encrypt_file_lowmem`.
+    """
+    own_timer = timer is None
+    if own_timer:
+        timer = StageTimer("decrypt", file=os.path.basename(fpath), low_memory=True)
+    undiffused, mode, temp_path = _open_undiffused(fpath, iterasi, x0, y0, memory_budget, work_dir, timer)
+    try:
+        h, w = undiffused.shape[:2]
+        timer.context.update(width=w, height=h, mode=mode, iterasi=iterasi)
+        channels = 1 if undiffused.ndim == 2 else 3
+        rows = rows_per_block(w, channels, memory_budget, bytes_per_pixel=_work_bytes_per_pixel(h, w))
+        name, _ = os.path.splitext(decrypted_filename(fpath))
+        saved_path = os.path.join(output_dir, name + ".png")
+        with PngStreamWriter(saved_path, w, h, mode) as writer, \
+                contextlib.closing(_permute_blocks(undiffused, iterasi, rows, work_dir, inverse=True)) as blocks:
+            for block in _timed_blocks(timer, "Invers ACM", blocks):
+                with timer.stage("Encode PNG", merge=True):
+                    writer.write_rows(block)
+    finally:
+        undiffused = None
+        _remove_temp(temp_path)
+    if own_timer:
+        write_record(timer)
+    return saved_path
@@ -0,0 +1,241 @@
+"""
+Instrumentasi waktu per tahap dan log performa terstruktur (JSON Lines).
+
+`StageTimer` mencatat durasi `perf_counter` dan memori setiap
+tahap (dekode, konversi, ACM, keystream, XOR, encode, tulis, pratinjau).
+Tahap bisa dibuka lewat context manager `stage()` atau cukup lewat
+callback `progress(tahap, fraksi)` yang sudah dipakai jalur enkripsi.
+Tahap yang berselang-seling per blok (mode hemat memori) dibuka dengan
+`merge=True` sehingga tercatat sekali dengan durasi dijumlahkan.
+Setiap operasi yang selesai ditambahkan sebagai satu baris JSON ke file
+log (lihat `configure` atau variabel lingkungan ACM_PERF_LOG).
+
+Memori per tahap memakai puncak tracemalloc bila diaktifkan
+(ACM_PERF_TRACE_MEMORY=1, lebih akurat tetapi memperlambat loop Python).
+Selain itu, di Linux titik tertinggi RSS direset di awal tahap (menulis
+"5" ke /proc/self/clear_refs) dan dibaca dari VmHWM di /proc/self/status
+di akhir tahap, sehingga alokasi sementara di dalam tahap ikut terlihat
+tanpa overhead tracemalloc. Jika reset tidak bisa dilakukan, dicatat RSS
+di awal dan akhir tahap beserta selisihnya (/proc/self/statm); jika itu
+pun tidak tersedia, hanya `process_max_rss_bytes`, yaitu titik tertinggi
+RSS sepanjang umur proses dan bukan puncak tahap.
+"""
+import os
+import sys
+import json
+import time
+import threading
+import contextlib
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+_log_path = os.environ.get("ACM_PERF_LOG") or None
+_log_lock = threading.Lock()
+TRACE_MEMORY = os.environ.get("ACM_PERF_TRACE_MEMORY") == "1"
+
+
+def configure(log_path=None, trace_memory=None):
+    """Mengatur file log JSON Lines (None = tidak menulis log) dan mode pelacakan memori."""
+    global _log_path, TRACE_MEMORY
+    _log_path = log_path
+    if trace_memory is not None:
+        TRACE_MEMORY = trace_memory
+
+
+def get_log_path():
+    return _log_path
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _current_rss_bytes():
+    """RSS proses saat ini dari /proc/self/statm (Linux); None bila tidak tersedia."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _reset_peak_rss():
+    """Mereset VmHWM proses ke RSS saat ini (Linux >= 4.0); True jika berhasil."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_bytes():
+    """Titik tertinggi RSS sejak reset terakhir (VmHWM di /proc/self/status); None bila tidak tersedia."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _max_rss_bytes():
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _merge_stage(previous, stage):
+    """Menggabungkan `stage` ke `previous` yang bernama sama (lihat `StageTimer.start_stage`)."""
+    previous["seconds"] += stage["seconds"]
+    for key, value in stage.items():
+        if value is None or key in ("name", "seconds", "memory_source", "rss_start_bytes"):
+            continue
+        if key == "rss_end_bytes" or previous.get(key) is None:
+            previous[key] = value
+        else:
+            previous[key] = max(previous[key], value)
+    # Cadangan RSS awal/akhir: awal dari bagian pertama, akhir dari bagian terakhir
+    if "rss_start_bytes" in previous and "rss_end_bytes" in previous:
+        previous["rss_delta_bytes"] = previous["rss_end_bytes"] - previous["rss_start_bytes"]
+
+
+class StageTimer:
+    """Pencatat durasi dan memori per tahap untuk satu operasi."""
+
+    def __init__(self, operation, trace_memory=None, **context):
+        self.operation = operation
+        self.context = context
+        self.trace_memory = TRACE_MEMORY if trace_memory is None else trace_memory
+        self.stages = []
+        self.timestamp = time.time()
+        self.total_seconds = None
+        self._start = time.perf_counter()
+        self._current = None
+        self._started_tracing = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @property
+    def current_stage(self):
+        return self._current["name"] if self._current else None
+
+    def start_stage(self, name, merge=False):
+        """Menutup tahap yang sedang berjalan (jika ada) lalu membuka tahap `name`.
+
+        Dengan `merge=True` hasilnya digabung ke tahap bernama sama yang sudah
+        tercatat: durasi dijumlahkan dan puncak memori diambil maksimumnya.
+        """
+        self.end_stage()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        peak_reset = not self.trace_memory and _reset_peak_rss()
+        self._current = {"name": name, "_merge": merge, "_peak_reset": peak_reset,
+                         "_rss_start": None if self.trace_memory else _current_rss_bytes(),
+                         "_start": time.perf_counter()}
+
+    def end_stage(self):
+        if self._current is None:
+            return
+        stage = self._current
+        stage["seconds"] = time.perf_counter() - stage.pop("_start")
+        rss_start = stage.pop("_rss_start")
+        peak_rss = _peak_rss_bytes() if stage.pop("_peak_reset") else None
+        rss_end = None if self.trace_memory or peak_rss is not None else _current_rss_bytes()
+        if self.trace_memory:
+            stage["peak_bytes"], stage["memory_source"] = tracemalloc.get_traced_memory()[1], "tracemalloc"
+        elif peak_rss is not None:
+            stage.update(peak_rss_bytes=peak_rss, memory_source="peak_rss")
+            if rss_start is not None:
+                stage["peak_rss_delta_bytes"] = peak_rss - rss_start
+        elif rss_start is not None and rss_end is not None:
+            stage.update(rss_start_bytes=rss_start, rss_end_bytes=rss_end, rss_delta_bytes=rss_end - rss_start,
+                         memory_source="rss")
+        else:
+            stage["process_max_rss_bytes"], stage["memory_source"] = _max_rss_bytes(), "max_rss"
+        self._current = None
+        previous = next((s for s in self.stages if s["name"] == stage["name"]), None) if stage.pop("_merge") else None
+        if previous is None:
+            self.stages.append(stage)
+        else:
+            _merge_stage(previous, stage)
+
+    def record_stage(self, name, seconds):
+        """Mencatat tahap yang durasinya diukur di luar timer (mis. di thread lain), tanpa data memori."""
+        self.end_stage()
+        self.stages.append({"name": name, "seconds": seconds})
+
+    @contextlib.contextmanager
+    def stage(self, name, merge=False):
+        self.start_stage(name, merge)
+        try:
+            yield self
+        finally:
+            self.end_stage()
+
+    def progress(self, stage, fraction=None):
+        """Callback progres: setiap nama tahap baru menutup tahap sebelumnya."""
+        if stage != self.current_stage:
+            self.start_stage(stage)
+
+    def chain(self, progress=None):
+        """Callback progres yang mencatat tahap lalu meneruskannya ke `progress` lain."""
+        if progress is None:
+            return self.progress
+
+        def chained(stage, fraction=None):
+            self.progress(stage, fraction)
+            progress(stage, fraction)
+        return chained
+
+    def finish(self, total_seconds=None):
+        """Menutup tahap terakhir dan menghitung total durasi; mengembalikan self.
+
+        `total_seconds` menggantikan durasi terukur, mis. untuk operasi yang dimulai sebelum timer dibuat.
+        """
+        if self.total_seconds is None:
+            self.end_stage()
+            self.total_seconds = time.perf_counter() - self._start if total_seconds is None else total_seconds
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        return self
+
+    def as_record(self):
+        """Representasi siap-JSON dari operasi ini."""
+        return {
+            "operation": self.operation,
+            "timestamp": self.timestamp,
+            "total_seconds": self.total_seconds,
+            "stages": [dict(s) for s in self.stages],
+            **self.context,
+        }
+
+    def summary(self):
+        """Ringkasan satu baris untuk GUI, mis. 'Dekode 0.12s | Permutasi ACM 0.05s | ... | total 1.80s'."""
+        parts = [f"{s['name']} {s['seconds']:.2f}s" for s in self.stages]
+        total = self.total_seconds if self.total_seconds is not None else time.perf_counter() - self._start
+        return " | ".join(parts + [f"total {total:.2f}s"])
+
+
+def write_record(timer, log_path=None):
+    """Menambahkan catatan `timer` sebagai satu baris JSON ke file log (jika log aktif)."""
+    path = log_path or _log_path
+    if not path:
+        return
+    line = json.dumps(timer.finish().as_record(), default=str) + "\n"
+    try:
+        with _log_lock:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line)
+    except OSError:
+        # Log performa tidak boleh menggagalkan proses enkripsi/dekripsi
+        pass
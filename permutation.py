@@ -0,0 +1,284 @@
+"""
+Mesin permutasi Arnold's Cat Map (ACM) tervektorisasi.
+
+Seluruh iterasi ACM digabung menjadi satu peta indeks: matriks ACM
+dipangkatkan modulo n (setelah jumlah iterasi direduksi modulo periode
+peta untuk n tersebut), lalu citra diacak dengan satu kali gather.
+Hasilnya identik bit per bit dengan versi loop piksel.
+
+Citra h x w yang tidak persegi ditutup oleh jendela persegi bersisi
+min(h, w) di sepanjang sisi panjangnya (jendela terakhir dirapatkan ke
+tepi sehingga tumpang tindih). ACM diterapkan per jendela berurutan, dan
+komposisinya tetap berupa satu peta indeks gather berukuran h*w.
+
+Peta indeks disimpan di `PermutationCache` (LRU dengan batas memori dan
+tingkat disk opsional berupa file .npy yang di-memory-map), sehingga
+pekerjaan berulang dengan ukuran dan iterasi yang sama tidak menghitung
+ulang permutasi.
+"""
+import os
+import functools
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Matriks ACM dengan parameter a=1, b=1: (x, y) -> (x + a*y, b*x + (a*b + 1)*y)
+ACM_A, ACM_B = 1, 1
+ACM_MATRIX = ((1, ACM_A), (ACM_B, ACM_A * ACM_B + 1))
+ACM_INVERSE_MATRIX = ((ACM_A * ACM_B + 1, -ACM_A), (-ACM_B, 1))
+
+
+def _mat_mul(m1, m2, n):
+    """Perkalian dua matriks 2x2 modulo n."""
+    return (
+        ((m1[0][0] * m2[0][0] + m1[0][1] * m2[1][0]) % n, (m1[0][0] * m2[0][1] + m1[0][1] * m2[1][1]) % n),
+        ((m1[1][0] * m2[0][0] + m1[1][1] * m2[1][0]) % n, (m1[1][0] * m2[0][1] + m1[1][1] * m2[1][1]) % n),
+    )
+
+
+def _mat_pow(m, k, n):
+    """Memangkatkan matriks 2x2 sebanyak k kali modulo n (square-and-multiply)."""
+    result = ((1 % n, 0), (0, 1 % n))
+    base = ((m[0][0] % n, m[0][1] % n), (m[1][0] % n, m[1][1] % n))
+    while k > 0:
+        if k & 1:
+            result = _mat_mul(result, base, n)
+        base = _mat_mul(base, base, n)
+        k >>= 1
+    return result
+
+
+@functools.lru_cache(maxsize=None)
+def acm_period(n):
+    """Periode ACM untuk citra n x n: iterasi terkecil yang mengembalikan citra semula."""
+    if n <= 1:
+        return 1
+    identity = ((1, 0), (0, 1))
+    m = _mat_pow(ACM_MATRIX, 1, n)
+    period = 1
+    # Periode ACM tidak pernah melebihi 3n
+    while m != identity:
+        m = _mat_mul(m, ACM_MATRIX, n)
+        period += 1
+    return period
+
+
+def reduce_iterations(n, iterasi):
+    """Mereduksi jumlah iterasi modulo periode ACM; iterasi <= 0 berarti identitas."""
+    if iterasi <= 0:
+        return 0
+    return iterasi % acm_period(n)
+
+
+def acm_windows(h, w):
+    """Jendela persegi (baris, kolom, sisi) yang menutupi citra h x w; citra persegi hanya punya satu jendela."""
+    side = min(h, w)
+    offsets = list(range(0, max(h, w) - side, side)) + [max(h, w) - side]
+    return [(0, o, side) if w >= h else (o, 0, side) for o in offsets]
+
+
+def acm_source_coords(n, iterasi, row_start=0, row_stop=None, inverse=False, width=None):
+    """Koordinat sumber (src_y, src_x) untuk baris tujuan [row_start, row_stop) setelah `iterasi` kali ACM.
+
+    `n` adalah tinggi citra dan `width` lebarnya (default n, persegi).
+    Berguna untuk memproses citra besar per blok baris tanpa membangun peta indeks penuh
+    (mode hemat memori); peta penuh dibangun lebih cepat oleh `acm_index_map`.
+    """
+    width = n if width is None else width
+    if row_stop is None:
+        row_stop = n
+    windows = acm_windows(n, width)
+    side = windows[0][2]
+    k = reduce_iterations(side, iterasi)
+    # Gather: piksel tujuan p mengambil sumber M^-k p (maju) atau M^k p (invers)
+    m = _mat_pow(ACM_MATRIX if inverse else ACM_INVERSE_MATRIX, k, side)
+    ys = np.arange(row_start, row_stop, dtype=np.int64)[:, None]
+    xs = np.arange(width, dtype=np.int64)[None, :]
+    shape = (row_stop - row_start, width)
+    if side == 1 or k == 0:
+        # ACM identitas: setiap piksel tetap di tempatnya
+        src_y, src_x = np.empty(shape, dtype=np.int64), np.empty(shape, dtype=np.int64)
+        src_y[:], src_x[:] = ys, xs
+        return src_y, src_x
+    if len(windows) == 1:
+        src_x = (m[0][0] * xs + m[0][1] * ys) % n
+        src_y = (m[1][0] * xs + m[1][1] * ys) % n
+        return src_y, src_x
+    # Jendela diterapkan berurutan, jadi gather maju menelusurinya dari yang terakhir dan invers dari yang pertama.
+    # Semua langkah memakai out=/where= pada empat array int64 dan satu mask, tanpa sementara per jendela.
+    src_y, src_x = np.empty(shape, dtype=np.int64), np.empty(shape, dtype=np.int64)
+    src_y[:], src_x[:] = ys, xs
+    new_y, new_x = np.empty(shape, dtype=np.int64), np.empty(shape, dtype=np.int64)
+    inside = np.empty(shape, dtype=bool)
+    for top, left, side in (windows if inverse else windows[::-1]):
+        # Jendela selalu selebar/setinggi sisi pendek citra, jadi cukup memeriksa sumbu panjangnya
+        pos, start = (src_x, left) if width > n else (src_y, top)
+        np.greater_equal(pos, start, out=inside)
+        inside &= pos < start + side
+        np.subtract(src_x, left, out=src_x, where=inside)
+        np.subtract(src_y, top, out=src_y, where=inside)
+        np.multiply(src_x, m[0][0], out=new_x)
+        np.multiply(src_y, m[0][1], out=new_y)
+        new_x += new_y
+        np.multiply(src_x, m[1][0], out=new_y)
+        np.multiply(src_y, m[1][1], out=src_x, where=inside)
+        np.add(new_y, src_x, out=new_y)
+        np.remainder(new_x, side, out=new_x)
+        new_x += left
+        np.remainder(new_y, side, out=new_y)
+        new_y += top
+        np.copyto(src_x, new_x, where=inside)
+        np.copyto(src_y, new_y, where=inside)
+    return src_y, src_x
+
+
+def acm_index_map(n, iterasi, inverse=False, width=None):
+    """Peta indeks gather datar untuk `iterasi` kali ACM (atau inversnya) pada citra n x width (default n x n).
+
+    Hasil `flat[idx]` sama dengan menjalankan ACM sebanyak `iterasi` kali.
+    """
+    width = n if width is None else width
+    index_dtype = np.int32 if n * width < 2**31 else np.int64
+    windows = acm_windows(n, width)
+    side = windows[0][2]
+    k = reduce_iterations(side, iterasi)
+    if len(windows) == 1 or side == 1 or k == 0:
+        src_y, src_x = acm_source_coords(n, iterasi, inverse=inverse, width=width)
+        return (src_y * width + src_x).astype(index_dtype).ravel()
+    # Citra tidak persegi: peta identitas diacak per irisan jendela dengan peta jendela persegi,
+    # sehingga total kerjanya sekitar satu lintasan atas semua piksel
+    square_map = acm_index_map(side, k, inverse=inverse)
+    index_map = np.arange(n * width, dtype=index_dtype).reshape(n, width)
+    for top, left, side in (windows[::-1] if inverse else windows):
+        window = index_map[top:top + side, left:left + side]
+        window[:] = window.ravel()[square_map].reshape(side, side)
+    return index_map.ravel()
+
+
+def invert_index_map(index_map):
+    """Membalik peta indeks gather: hasilnya membatalkan `index_map`."""
+    inverse_map = np.empty_like(index_map)
+    inverse_map[index_map] = np.arange(index_map.size, dtype=index_map.dtype)
+    return inverse_map
+
+
+class PermutationCache:
+    """Cache peta indeks ACM dengan eviksi LRU di bawah batas memori `max_bytes`.
+
+    Kunci cache adalah (tinggi, lebar, iterasi tereduksi); peta maju dan invers disimpan
+    bersama. Jika `cache_dir` diberikan, peta juga ditulis sebagai file .npy
+    dan dimuat ulang dengan memory-map oleh proses berikutnya.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, cache_dir=None):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, n, iterasi, inverse=False, width=None):
+        """Mengembalikan peta indeks untuk citra n x width (default persegi), iterasi dan arah; dihitung bila perlu."""
+        width = n if width is None else width
+        key = (n, width, reduce_iterations(min(n, width), iterasi))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[1 if inverse else 0]
+        entry = self._load_from_disk(key)
+        if entry is None:
+            forward_map = acm_index_map(n, key[2], width=width)
+            entry = (forward_map, invert_index_map(forward_map))
+            self._save_to_disk(key, entry)
+        self._store(key, entry)
+        return entry[1 if inverse else 0]
+
+    def clear(self):
+        """Mengosongkan tingkat memori (file di disk tidak dihapus)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _store(self, key, entry):
+        entry_bytes = entry[0].nbytes + entry[1].nbytes
+        if entry_bytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            self.current_bytes += entry_bytes
+            while self.current_bytes > self.max_bytes:
+                _, (old_forward, old_inverse) = self._entries.popitem(last=False)
+                self.current_bytes -= old_forward.nbytes + old_inverse.nbytes
+
+    def _disk_paths(self, key):
+        h, w, k = key
+        size = str(h) if h == w else f"{h}x{w}"
+        return (os.path.join(self.cache_dir, f"acm_{size}_{k}_fwd.npy"),
+                os.path.join(self.cache_dir, f"acm_{size}_{k}_inv.npy"))
+
+    def _load_from_disk(self, key):
+        if not self.cache_dir:
+            return None
+        paths = self._disk_paths(key)
+        if not all(os.path.exists(p) for p in paths):
+            return None
+        try:
+            entry = tuple(np.load(p, mmap_mode='r') for p in paths)
+        except (OSError, ValueError):
+            return None
+        # File basi atau asing dengan nama yang sama tidak boleh sampai ke np.take: hitung ulang saja
+        h, w, _ = key
+        if any(m.dtype.kind != 'i' or m.shape != (h * w,) for m in entry):
+            return None
+        return entry
+
+    def _save_to_disk(self, key, entry):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for path, index_map in zip(self._disk_paths(key), entry):
+                # Tulis ke file sementara dulu agar proses lain tidak membaca file setengah jadi
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, index_map)
+                os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+default_cache = PermutationCache(
+    max_bytes=int(os.environ.get("ACM_CACHE_MAX_MB", "256")) * 1024 * 1024,
+    cache_dir=os.environ.get("ACM_CACHE_DIR") or None,
+)
+
+
+def configure_cache(max_bytes=None, cache_dir=None):
+    """Mengatur batas memori dan/atau direktori disk untuk cache bawaan."""
+    if max_bytes is not None:
+        default_cache.max_bytes = max_bytes
+    if cache_dir is not None:
+        default_cache.cache_dir = cache_dir or None
+    default_cache.clear()
+
+
+def apply_permutation(image_array, index_map):
+    """Menerapkan peta indeks datar pada citra (2D atau 3D) dengan satu kali gather."""
+    n_pixels = image_array.shape[0] * image_array.shape[1]
+    flat = image_array.reshape((n_pixels,) + image_array.shape[2:])
+    return np.take(flat, index_map, axis=0).reshape(image_array.shape)
+
+
+def arnold_cat_map(image_array, iterasi):
+    """Mengacak posisi piksel menggunakan ACM dengan parameter a=1, b=1."""
+    h, w = image_array.shape[:2]
+    return apply_permutation(image_array, default_cache.get(h, iterasi, width=w))
+
+
+def inverse_arnold_cat_map(image_array, iterasi):
+    """Mengembalikan posisi piksel menggunakan invers ACM dengan parameter a=1, b=1."""
+    h, w = image_array.shape[:2]
+    return apply_permutation(image_array, default_cache.get(h, iterasi, inverse=True, width=w))
@@ -0,0 +1,178 @@
+"""
+Eksekutor pipeline untuk enkripsi/dekripsi berurutan dengan tahap yang tumpang tindih.
+
+Keystream Duffing hanya bergantung pada ukuran citra, jumlah kanal dan
+(x0, y0), bukan pada isi piksel. Karena itu keystream dibangkitkan di
+worker terpisah begitu header citra terbaca (termasuk untuk citra
+berikutnya), sementara thread utama mendekode dan mengacak piksel.
+Penyimpanan PNG citra ke-k berjalan di thread penulis sambil citra
+ke-(k+1) diproses, sehingga waktu per citra mendekati tahap terlama.
+"""
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+
+from cipher import load_image_for_encryption, encrypted_filename, decrypted_filename, check_output_format
+from container import is_container, read_header, load_container, check_key, write_container, new_salt
+from permutation import arnold_cat_map, inverse_arnold_cat_map
+from keystream import generate_keystream_duffing_map
+from perf_log import StageTimer, write_record
+
+
+def probe_keystream_shape(fpath, mode):
+    """Membaca header citra saja dan mengembalikan (tinggi, lebar, channels) yang dibutuhkan keystream."""
+    if mode == "decrypt" and is_container(fpath):
+        header = read_header(fpath)
+        return header.height, header.width, header.channels
+    with Image.open(fpath) as img:
+        w, h = img.size
+        image_mode = img.mode
+        single_band = len(img.getbands()) == 1
+    if mode == "encrypt":
+        # Mengikuti load_image_for_encryption: L tetap L, mode lain menjadi RGB, ukuran tidak berubah
+        return h, w, 1 if image_mode == 'L' else 3
+    return h, w, 1 if single_band else 3
+
+
+class CipherPipeline:
+    """Memproses daftar file dengan keystream, dekode/permutasi dan penyimpanan yang tumpang tindih.
+
+    `keystream_executor` dapat diganti (mis. ProcessPoolExecutor) agar pembangkitan
+    keystream tidak berbagi GIL dengan thread utama.
+    """
+
+    def __init__(self, mode, output_dir, iterasi, x0, y0, keystream_executor=None, max_pending_writes=2,
+                 output_format="png"):
+        if mode not in ("encrypt", "decrypt"):
+            raise ValueError(f"Mode tidak dikenal: {mode}")
+        check_output_format(output_format)
+        self.mode = mode
+        self.output_dir = output_dir
+        self.iterasi, self.x0, self.y0 = iterasi, x0, y0
+        self.keystream_executor = keystream_executor
+        self.max_pending_writes = max_pending_writes
+        self.output_format = output_format
+        self.salt = new_salt()
+
+    def _submit_keystream(self, executor, fpath):
+        h, w, channels = probe_keystream_shape(fpath, self.mode)
+        return executor.submit(generate_keystream_duffing_map, h, self.x0, self.y0, channels, width=w)
+
+    def _transform(self, fpath, keystream_future, stages):
+        """Dekode + permutasi/XOR di thread utama; mengembalikan (array_hasil, mode_citra)."""
+        t = time.perf_counter()
+        if self.mode == "encrypt":
+            arr, image_mode = load_image_for_encryption(fpath)
+            stages["decode"] = time.perf_counter() - t
+            t = time.perf_counter()
+            arr = arnold_cat_map(arr, self.iterasi)
+            stages["permute"] = time.perf_counter() - t
+            t = time.perf_counter()
+            keystream = keystream_future.result()
+            stages["keystream_wait"] = time.perf_counter() - t
+            t = time.perf_counter()
+            np.bitwise_xor(arr, keystream, out=arr)
+            stages["xor"] = time.perf_counter() - t
+        else:
+            if is_container(fpath):
+                header, arr = load_container(fpath)
+                check_key(header, self.iterasi, self.x0, self.y0)
+                image_mode = header.mode
+            else:
+                with Image.open(fpath) as img:
+                    image_mode = img.mode
+                    arr = np.array(img)
+            stages["decode"] = time.perf_counter() - t
+            t = time.perf_counter()
+            keystream = keystream_future.result()
+            stages["keystream_wait"] = time.perf_counter() - t
+            t = time.perf_counter()
+            arr = np.bitwise_xor(arr, keystream)
+            stages["xor"] = time.perf_counter() - t
+            t = time.perf_counter()
+            arr = inverse_arnold_cat_map(arr, self.iterasi)
+            stages["permute"] = time.perf_counter() - t
+        return arr, image_mode
+
+    def _save(self, arr, image_mode, saved_path, stages):
+        t = time.perf_counter()
+        if self.mode == "encrypt" and self.output_format == "acm":
+            write_container(saved_path, arr, self.iterasi, self.x0, self.y0, self.salt)
+            stages["encode"] = time.perf_counter() - t
+            return
+        img = Image.fromarray(arr.astype('uint8'), mode=image_mode)
+        if self.mode == "encrypt":
+            img.save(saved_path, format='PNG')
+        else:
+            img.save(saved_path)
+        stages["encode"] = time.perf_counter() - t
+
+    def _write_perf_record(self, result):
+        """Mencatat durasi tahap satu file ke log performa; tahap diukur di thread utama dan penulis."""
+        timer = StageTimer(self.mode, trace_memory=False, file=os.path.basename(result["input"]),
+                           iterasi=self.iterasi, pipeline=True)
+        for name, seconds in result["stages"].items():
+            timer.record_stage(name, seconds)
+        write_record(timer.finish(result["seconds"]))
+
+    def run(self, paths, on_result=None):
+        """Memproses semua `paths`; hasil per file berformat sama dengan `batch.run_batch` plus kunci stages."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        results = []
+        pending = deque()
+
+        def finish(write_future, result):
+            try:
+                write_future.result()
+                result["output"] = result.pop("_saved_path")
+            except Exception as e:
+                result.pop("_saved_path", None)
+                result["error"] = str(e)
+            result["seconds"] = time.perf_counter() - result.pop("_start")
+            if not result["error"]:
+                self._write_perf_record(result)
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+        own_executor = self.keystream_executor is None
+        keystream_executor = ThreadPoolExecutor(max_workers=1) if own_executor else self.keystream_executor
+        try:
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                next_future = None
+                for i, fpath in enumerate(paths):
+                    result = {"input": fpath, "output": None, "seconds": 0.0, "bytes": 0, "error": None,
+                              "stages": {}, "_start": time.perf_counter()}
+                    try:
+                        keystream_future = next_future or self._submit_keystream(keystream_executor, fpath)
+                        next_future = None
+                        # Keystream citra berikutnya dimulai sebelum citra ini didekode
+                        if i + 1 < len(paths):
+                            try:
+                                next_future = self._submit_keystream(keystream_executor, paths[i + 1])
+                            except Exception:
+                                next_future = None
+                        arr, image_mode = self._transform(fpath, keystream_future, result["stages"])
+                        result["bytes"] = os.path.getsize(fpath)
+                        name = encrypted_filename(fpath, self.output_format) if self.mode == "encrypt" else decrypted_filename(fpath)
+                        result["_saved_path"] = os.path.join(self.output_dir, name)
+                    except Exception as e:
+                        result["error"] = str(e)
+                        result["seconds"] = time.perf_counter() - result.pop("_start")
+                        results.append(result)
+                        if on_result:
+                            on_result(result)
+                        continue
+                    pending.append((writer.submit(self._save, arr, image_mode, result["_saved_path"], result["stages"]), result))
+                    del arr
+                    while len(pending) > self.max_pending_writes:
+                        finish(*pending.popleft())
+                while pending:
+                    finish(*pending.popleft())
+        finally:
+            if own_executor:
+                keystream_executor.shutdown(wait=True)
+        return results
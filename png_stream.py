@@ -0,0 +1,218 @@
+"""
+Penulis dan pembaca PNG per blok baris untuk mode hemat memori.
+
+Hanya mendukung PNG 8-bit non-interlaced dengan tipe warna L atau RGB.
+Penulis memakai filter None. Pembaca mendukung kelima filter PNG: None,
+Sub dan Up dibatalkan dengan numpy, sedangkan blok yang memakai Average
+atau Paeth (dipakai Pillow saat menyimpan PNG biasa) dibatalkan oleh
+dekoder C Pillow per blok. PNG lain melempar `UnsupportedPngError` saat
+dibuka.
+"""
+import io
+import os
+import struct
+import zlib
+import numpy as np
+from PIL import Image
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+COLOR_TYPES = {'L': 0, 'RGB': 2}
+CHANNELS = {'L': 1, 'RGB': 3}
+
+
+class UnsupportedPngError(ValueError):
+    """PNG tidak bisa dibaca secara streaming oleh `PngStreamReader`."""
+
+
+def _ihdr(width, height, mode):
+    return struct.pack('>IIBBBBB', width, height, 8, COLOR_TYPES[mode], 0, 0, 0)
+
+
+def _write_chunk(f, chunk_type, data):
+    f.write(struct.pack('>I', len(data)))
+    f.write(chunk_type)
+    f.write(data)
+    f.write(struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff))
+
+
+class PngStreamWriter:
+    """Menulis PNG blok demi blok baris; memori yang dipakai sebatas satu blok."""
+
+    def __init__(self, fpath, width, height, mode, compress_level=6, chunk_size=1 << 20):
+        if mode not in COLOR_TYPES:
+            raise UnsupportedPngError(f"Mode PNG tidak didukung: {mode}")
+        self.width, self.height, self.mode = width, height, mode
+        self.row_bytes = width * CHANNELS[mode]
+        self.rows_written = 0
+        self.chunk_size = chunk_size
+        self._compressor = zlib.compressobj(compress_level)
+        self._pending = bytearray()
+        self._file = open(fpath, 'wb')
+        self._file.write(PNG_SIGNATURE)
+        _write_chunk(self._file, b'IHDR', _ihdr(width, height, mode))
+
+    def write_rows(self, rows):
+        """Menulis blok baris berbentuk (baris, lebar) atau (baris, lebar, kanal) bertipe uint8."""
+        rows = np.ascontiguousarray(rows, dtype=np.uint8).reshape(-1, self.row_bytes)
+        # Setiap baris diawali byte filter 0 (None)
+        filtered = np.zeros((rows.shape[0], self.row_bytes + 1), dtype=np.uint8)
+        filtered[:, 1:] = rows
+        self._pending += self._compressor.compress(filtered.tobytes())
+        self.rows_written += rows.shape[0]
+        self._flush(final=False)
+
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            if self.rows_written != self.height:
+                raise ValueError(f"Jumlah baris PNG tidak lengkap: {self.rows_written}/{self.height}")
+            self._pending += self._compressor.flush()
+            self._flush(final=True)
+            _write_chunk(self._file, b'IEND', b'')
+        finally:
+            self._file.close()
+            self._file = None
+
+    def _flush(self, final):
+        while len(self._pending) >= self.chunk_size or (final and self._pending):
+            data = bytes(self._pending[:self.chunk_size])
+            del self._pending[:self.chunk_size]
+            _write_chunk(self._file, b'IDAT', data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self._file is not None:
+            self._file.close()
+            self._file = None
+        else:
+            self.close()
+
+
+class PngStreamReader:
+    """Membaca PNG blok demi blok baris tanpa memuat seluruh citra."""
+
+    def __init__(self, fpath):
+        self._file = open(fpath, 'rb')
+        try:
+            if self._file.read(8) != PNG_SIGNATURE:
+                raise UnsupportedPngError("Bukan file PNG")
+            chunk_type, data = self._read_chunk()
+            if chunk_type != b'IHDR':
+                raise UnsupportedPngError("Chunk IHDR tidak ditemukan")
+            width, height, depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', data)
+            modes = {v: k for k, v in COLOR_TYPES.items()}
+            if depth != 8 or interlace != 0 or color_type not in modes:
+                raise UnsupportedPngError("Hanya PNG 8-bit L/RGB non-interlaced yang didukung")
+        except Exception:
+            self._file.close()
+            raise
+        self.width, self.height, self.mode = width, height, modes[color_type]
+        self.channels = CHANNELS[self.mode]
+        self.row_bytes = width * self.channels
+
+    def _read_chunk(self):
+        header = self._file.read(8)
+        if len(header) < 8:
+            raise UnsupportedPngError("File PNG terpotong")
+        length, chunk_type = struct.unpack('>I4s', header)
+        data = self._file.read(length)
+        self._file.read(4)  # CRC
+        return chunk_type, data
+
+    def _iter_idat(self, piece_size=1 << 16):
+        """Data IDAT dalam potongan kecil agar chunk besar tidak dibaca utuh ke memori."""
+        while True:
+            header = self._file.read(8)
+            if len(header) < 8:
+                raise UnsupportedPngError("File PNG terpotong")
+            length, chunk_type = struct.unpack('>I4s', header)
+            if chunk_type == b'IEND':
+                return
+            if chunk_type != b'IDAT':
+                self._file.seek(length + 4, os.SEEK_CUR)
+                continue
+            while length:
+                piece = self._file.read(min(length, piece_size))
+                if not piece:
+                    raise UnsupportedPngError("File PNG terpotong")
+                length -= len(piece)
+                yield piece
+            self._file.read(4)  # CRC
+
+    def iter_rows(self, rows_per_block):
+        """Menghasilkan blok baris uint8 berbentuk (baris, lebar) atau (baris, lebar, kanal)."""
+        stride = self.row_bytes + 1
+        decompressor = zlib.decompressobj()
+        pending = bytearray()
+        prev_row = np.zeros(self.row_bytes, dtype=np.uint8)
+        rows_done = 0
+        idat = self._iter_idat()
+        while rows_done < self.height:
+            block_rows = min(rows_per_block, self.height - rows_done)
+            need = block_rows * stride
+            while len(pending) < need:
+                # Dekompresi dibatasi sebanyak yang masih dibutuhkan blok ini; sisanya tetap terkompresi
+                data = decompressor.unconsumed_tail or next(idat, None)
+                if data is None:
+                    raise UnsupportedPngError("Data IDAT terpotong")
+                pending += decompressor.decompress(data, need - len(pending))
+            raw = np.frombuffer(pending, dtype=np.uint8, count=need).reshape(block_rows, stride).copy()
+            del pending[:need]
+            if raw[:, 0].max() <= 2:
+                block = np.empty((block_rows, self.row_bytes), dtype=np.uint8)
+                for i in range(block_rows):
+                    block[i] = self._unfilter(raw[i, 0], raw[i, 1:], prev_row)
+                    prev_row = block[i]
+            else:
+                block = self._unfilter_block(raw, prev_row)
+                prev_row = block[-1]
+            rows_done += block_rows
+            if self.channels == 1:
+                yield block
+            else:
+                yield block.reshape(block_rows, self.width, self.channels)
+
+    def _unfilter(self, filter_type, row, prev_row):
+        if filter_type == 0:
+            return row
+        if filter_type == 1:
+            # Sub: jumlah kumulatif per kanal sepanjang baris (uint8 otomatis modulo 256)
+            return np.cumsum(row.reshape(self.width, self.channels), axis=0, dtype=np.uint8).ravel()
+        if filter_type == 2:
+            return row + prev_row
+        raise UnsupportedPngError(f"Filter PNG {filter_type} tidak didukung untuk mode streaming")
+
+    def _unfilter_block(self, raw, prev_row):
+        """Membatalkan filter satu blok (termasuk Average/Paeth) dengan dekoder C Pillow.
+
+        Blok dibungkus menjadi PNG kecil tanpa kompresi yang diawali baris
+        sebelumnya (filter None), sehingga filter yang merujuk baris atas tetap benar.
+        """
+        if raw[:, 0].max() > 4:
+            raise UnsupportedPngError(f"Filter PNG {raw[:, 0].max()} tidak valid")
+        rows = np.empty((raw.shape[0] + 1, raw.shape[1]), dtype=np.uint8)
+        rows[0, 0] = 0
+        rows[0, 1:] = prev_row
+        rows[1:] = raw
+        buf = io.BytesIO()
+        buf.write(PNG_SIGNATURE)
+        _write_chunk(buf, b'IHDR', _ihdr(self.width, rows.shape[0], self.mode))
+        _write_chunk(buf, b'IDAT', zlib.compress(rows.data, 0))
+        del rows
+        _write_chunk(buf, b'IEND', b'')
+        buf.seek(0)
+        with Image.open(buf) as img:
+            block = np.asarray(img)
+        return block.reshape(-1, self.row_bytes)[1:]
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
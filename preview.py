@@ -0,0 +1,107 @@
+"""
+Subsistem pratinjau: thumbnail dengan cache LRU tanpa membaca ulang file besar.
+
+Thumbnail disimpan sebagai PIL Image (bukan PhotoImage, agar bisa dibuat
+di thread worker) dengan kunci path + mtime + ukuran file, sehingga file
+yang berubah otomatis dianggap baru. Hasil enkripsi/dekripsi langsung
+dibuatkan thumbnail dari array di memori oleh `cipher`, sehingga GUI tidak
+perlu mendekode ulang PNG yang baru saja ditulis. Untuk JPEG dipakai
+dekode tereduksi `draft()`, dan kontainer .acm cukup dibaca selang-seling
+lewat memmap.
+"""
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from PIL import Image
+
+from container import is_container, load_container
+
+DEFAULT_BOX = (350, 350)
+
+
+def _file_key(fpath):
+    st = os.stat(fpath)
+    return (os.path.abspath(fpath), st.st_mtime_ns, st.st_size)
+
+
+def thumbnail_from_array(arr, box=DEFAULT_BOX, mode=None):
+    """Thumbnail dari array L/RGB; array besar dicuplik selang-seling dulu agar tidak disalin utuh."""
+    h, w = arr.shape[:2]
+    step = max(1, int(max(h / box[1], w / box[0]) / 2))
+    img = Image.fromarray(np.ascontiguousarray(arr[::step, ::step]), mode=mode)
+    img.thumbnail(box, Image.LANCZOS)
+    return img
+
+
+def _thumbnail_from_file(fpath, box):
+    if is_container(fpath):
+        header, pixels = load_container(fpath, verify=False)
+        return thumbnail_from_array(pixels, box, header.mode)
+    with Image.open(fpath) as img:
+        if img.format == "JPEG":
+            # Dekode JPEG pada skala 1/2, 1/4 atau 1/8 yang masih >= ukuran thumbnail
+            img.draft(img.mode if img.mode in ('L', 'RGB') else 'RGB', box)
+        img.thumbnail(box, Image.LANCZOS)
+        return img
+
+
+class PreviewCache:
+    """Cache LRU thumbnail per file (path + mtime) dan per ukuran kotak."""
+
+    def __init__(self, max_files=64):
+        self.max_files = max_files
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, fpath, box=DEFAULT_BOX):
+        """Thumbnail `fpath` yang muat dalam `box`; dari cache bila file belum berubah."""
+        key = _file_key(fpath)
+        with self._lock:
+            thumbnails = self._entries.get(key)
+            if thumbnails is not None:
+                self._entries.move_to_end(key)
+                if box in thumbnails:
+                    self.hits += 1
+                    return thumbnails[box]
+                # Turunkan dari thumbnail lebih besar yang sudah ada
+                larger = [b for b in thumbnails if b[0] >= box[0] and b[1] >= box[1]]
+                if larger:
+                    img = thumbnails[min(larger)].copy()
+                    img.thumbnail(box, Image.LANCZOS)
+                    thumbnails[box] = img
+                    self.hits += 1
+                    return img
+            self.misses += 1
+        img = _thumbnail_from_file(fpath, box)
+        self._store(key, box, img)
+        return img
+
+    def put_array(self, fpath, arr, box=DEFAULT_BOX, mode=None):
+        """Membuat thumbnail dari array yang baru saja disimpan ke `fpath` dan memasukkannya ke cache."""
+        img = thumbnail_from_array(arr, box, mode)
+        self._store(_file_key(fpath), box, img)
+        return img
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key, box, img):
+        with self._lock:
+            # Entri lama milik path yang sama (mtime berbeda) sudah usang
+            for old_key in [k for k in self._entries if k[0] == key[0] and k != key]:
+                del self._entries[old_key]
+            self._entries.setdefault(key, {})[box] = img
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_files:
+                self._entries.popitem(last=False)
+
+
+default_cache = PreviewCache()
+
+
+def load_preview(fpath, box=DEFAULT_BOX):
+    """Thumbnail `fpath` dari cache bawaan."""
+    return default_cache.get(fpath, box)
@@ -0,0 +1,254 @@
+"""
+Mode sekuens frame: mengenkripsi/mendekripsi direktori frame atau satu
+file TIFF/GIF multi-frame dengan kunci yang sama.
+
+Semua frame berukuran sama, sehingga peta permutasi ACM dan keystream
+Duffing cukup dihitung sekali; setiap frame lalu hanya melewati satu
+kernel gather + XOR. Dekode berjalan di thread pembaca (read-ahead) dan
+penyimpanan di thread penulis (write-behind), keduanya dengan antrian
+terbatas agar memori tetap terkendali.
+
+Opsi `per_frame_keystream` memberi setiap frame keystream berbeda dengan
+melanjutkan state Duffing dari frame sebelumnya (frame pertama identik
+dengan enkripsi citra tunggal). Dekripsi harus memakai opsi yang sama.
+
+Contoh:
+    python sequence.py encrypt frames/ -o hasil/ --iterasi 10 -a 0.1 -b 0.1
+    python sequence.py encrypt rekaman.tif -o hasil/ --per-frame-keystream --format acm
+    python sequence.py decrypt hasil/ -o asli/ --per-frame-keystream
+"""
+import os
+import sys
+import time
+import queue
+import argparse
+import threading
+import numpy as np
+from PIL import Image, ImageSequence
+
+from cipher import (IMAGE_EXTENSIONS, CONTAINER_EXTENSION, OUTPUT_FORMATS, prepare_image, encrypted_filename,
+                    decrypted_filename, check_output_format)
+from container import is_container, load_container, check_key, write_container, new_salt
+from permutation import default_cache as permutation_cache
+from keystream import generate_keystream_duffing_map, KeystreamStream
+
+_DONE = object()
+
+
+def _put(q, item, stop):
+    """`q.put` yang tetap bisa dihentikan lewat event `stop` ketika antrian penuh."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(q, stop):
+    while True:
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            if stop.is_set():
+                return _DONE
+
+
+def list_frames(source, mode):
+    """Daftar (nama_frame, pemuat) untuk direktori frame atau file multi-frame.
+
+    Pemuat mengembalikan PIL Image, atau (header, piksel) untuk kontainer .acm.
+    """
+    if os.path.isdir(source):
+        extensions = IMAGE_EXTENSIONS + ((CONTAINER_EXTENSION, ".tif", ".tiff") if mode == "decrypt" else (".tif", ".tiff"))
+        paths = sorted(os.path.join(source, f) for f in os.listdir(source) if f.lower().endswith(extensions))
+        return [(p, lambda p=p: _open_frame_file(p)) for p in paths]
+    with Image.open(source) as img:
+        n_frames = getattr(img, "n_frames", 1)
+    stem, _ = os.path.splitext(os.path.basename(source))
+    return [(f"{stem}_{i:05d}.png", None) for i in range(n_frames)]
+
+
+def _open_frame_file(fpath):
+    if is_container(fpath):
+        return load_container(fpath)
+    img = Image.open(fpath)
+    img.load()
+    return img
+
+
+def _iter_frames(source, frames):
+    """Menghasilkan (nama, PIL Image atau (header, piksel)) secara berurutan."""
+    if os.path.isdir(source):
+        for name, load in frames:
+            yield name, load()
+        return
+    with Image.open(source) as img:
+        for (name, _), frame in zip(frames, ImageSequence.Iterator(img)):
+            yield name, frame.copy()
+
+
+class SequenceCipher:
+    """Memproses semua frame sebuah sekuens dengan permutasi dan keystream yang dihitung sekali."""
+
+    def __init__(self, mode, output_dir, iterasi, x0, y0, per_frame_keystream=False, output_format="png",
+                 read_ahead=4, write_behind=4):
+        if mode not in ("encrypt", "decrypt"):
+            raise ValueError(f"Mode tidak dikenal: {mode}")
+        check_output_format(output_format)
+        self.mode = mode
+        self.output_dir = output_dir
+        self.iterasi, self.x0, self.y0 = iterasi, x0, y0
+        self.per_frame_keystream = per_frame_keystream
+        self.output_format = output_format
+        self.read_ahead, self.write_behind = read_ahead, write_behind
+        self.salt = new_salt()
+
+    def _decode(self, frame):
+        """Frame mentah -> (array, mode) sesuai arah proses."""
+        if isinstance(frame, tuple):
+            header, pixels = frame
+            check_key(header, self.iterasi, self.x0, self.y0)
+            return pixels, header.mode
+        if self.mode == "encrypt":
+            return prepare_image(frame)
+        if frame.mode not in ('L', 'RGB'):
+            raise ValueError(f"Mode frame terenkripsi tidak didukung: {frame.mode}")
+        return np.array(frame), frame.mode
+
+    def _reader(self, source, frames, read_queue, stop):
+        try:
+            for name, frame in _iter_frames(source, frames):
+                if not _put(read_queue, (name,) + self._decode(frame), stop):
+                    return
+        except Exception as e:
+            _put(read_queue, e, stop)
+            return
+        _put(read_queue, _DONE, stop)
+
+    def _writer(self, write_queue, outputs, errors, stop):
+        while True:
+            item = _get(write_queue, stop)
+            if item is _DONE:
+                return
+            name, arr, image_mode = item
+            try:
+                if self.mode == "encrypt":
+                    saved_path = os.path.join(self.output_dir, encrypted_filename(name, self.output_format))
+                    if self.output_format == "acm":
+                        write_container(saved_path, arr, self.iterasi, self.x0, self.y0, self.salt)
+                    else:
+                        Image.fromarray(arr, mode=image_mode).save(saved_path, format='PNG')
+                else:
+                    saved_path = os.path.join(self.output_dir, decrypted_filename(name))
+                    Image.fromarray(arr, mode=image_mode).save(saved_path)
+                outputs.append(saved_path)
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+                return
+
+    def _keystreams(self, shape):
+        """Keystream per frame, sudah dipermutasi untuk dekripsi sehingga kernelnya tetap gather + XOR."""
+        h, w = shape[:2]
+        channels = 1 if len(shape) == 2 else shape[2]
+        inverse_map = permutation_cache.get(h, self.iterasi, inverse=True, width=w) if self.mode == "decrypt" else None
+
+        def prepare(keystream):
+            if inverse_map is None:
+                return keystream.reshape(h * w, channels)
+            return np.take(keystream.reshape(h * w, channels), inverse_map, axis=0)
+
+        if not self.per_frame_keystream:
+            shared = prepare(generate_keystream_duffing_map(h, self.x0, self.y0, channels=channels, width=w))
+            while True:
+                yield shared
+        stream = KeystreamStream(self.x0, self.y0)
+        while True:
+            yield prepare(stream.read(h * w * channels))
+
+    def run(self, source, progress=None):
+        """Memproses `source` (direktori atau file multi-frame); mengembalikan ringkasan termasuk FPS."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        frames = list_frames(source, self.mode)
+        if not frames:
+            raise ValueError(f"Tidak ada frame ditemukan di {source}")
+        read_queue = queue.Queue(maxsize=self.read_ahead)
+        write_queue = queue.Queue(maxsize=self.write_behind)
+        stop = threading.Event()
+        outputs, errors = [], []
+        reader = threading.Thread(target=self._reader, args=(source, frames, read_queue, stop), daemon=True)
+        writer = threading.Thread(target=self._writer, args=(write_queue, outputs, errors, stop), daemon=True)
+        start_time = time.perf_counter()
+        reader.start(); writer.start()
+        count = 0
+        first_shape = index_map = keystreams = None
+        try:
+            while True:
+                item = _get(read_queue, stop)
+                if item is _DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                name, arr, image_mode = item
+                if first_shape is None:
+                    first_shape, first_mode = arr.shape, image_mode
+                    index_map = permutation_cache.get(arr.shape[0], self.iterasi, inverse=self.mode == "decrypt",
+                                                      width=arr.shape[1])
+                    keystreams = self._keystreams(arr.shape)
+                elif arr.shape != first_shape or image_mode != first_mode:
+                    raise ValueError(f"Frame {os.path.basename(name)} ({image_mode} {arr.shape}) berbeda dari "
+                                     f"frame pertama ({first_mode} {first_shape})")
+                # Kernel tunggal: gather permutasi lalu XOR di tempat dengan keystream (yang sudah disiapkan)
+                flat = np.take(arr.reshape(index_map.size, -1), index_map, axis=0)
+                np.bitwise_xor(flat, next(keystreams), out=flat)
+                if not _put(write_queue, (name, flat.reshape(first_shape), image_mode), stop):
+                    break
+                count += 1
+                if progress:
+                    progress("Frame", count / len(frames))
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            _put(write_queue, _DONE, stop)
+            writer.join()
+            stop.set()
+            reader.join()
+        if errors:
+            raise errors[0]
+        elapsed_time = time.perf_counter() - start_time
+        return {"frames": count, "seconds": elapsed_time, "fps": count / elapsed_time if elapsed_time > 0 else 0.0,
+                "outputs": sorted(outputs)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enkripsi/dekripsi sekuens frame (direktori atau TIFF/GIF multi-frame).")
+    parser.add_argument("mode", choices=("encrypt", "decrypt"))
+    parser.add_argument("input", help="Direktori frame atau file TIFF/GIF multi-frame")
+    parser.add_argument("-o", "--output", required=True, help="Direktori output")
+    parser.add_argument("--iterasi", type=int, default=10, help="Iterasi ACM (default: 10)")
+    parser.add_argument("-a", "--x0", type=float, default=0.1, help="Kunci a / x0 Duffing (default: 0.1)")
+    parser.add_argument("-b", "--y0", type=float, default=0.1, help="Kunci b / y0 Duffing (default: 0.1)")
+    parser.add_argument("--per-frame-keystream", action="store_true",
+                        help="Keystream berbeda per frame dengan melanjutkan state Duffing")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="png", help="Format frame terenkripsi (default: png)")
+    parser.add_argument("--read-ahead", type=int, default=4, help="Jumlah frame terdekode yang boleh antri (default: 4)")
+    parser.add_argument("--write-behind", type=int, default=4, help="Jumlah frame hasil yang boleh antri simpan (default: 4)")
+    args = parser.parse_args(argv)
+
+    cipher = SequenceCipher(args.mode, args.output, args.iterasi, args.x0, args.y0,
+                            per_frame_keystream=args.per_frame_keystream, output_format=args.format,
+                            read_ahead=args.read_ahead, write_behind=args.write_behind)
+    try:
+        summary = cipher.run(args.input)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"{summary['frames']} frame selesai dalam {summary['seconds']:.2f} detik ({summary['fps']:.2f} FPS)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+Uji sensitivitas kunci: mengenkripsi satu citra dengan banyak kunci lalu
+membandingkan setiap pasangan ciphertext (NPCR, UACI dan korelasi).
+
+Kunci bisa berupa grid (kombinasi iterasi x a x b) atau gangguan kecil
+di sekitar kunci dasar (a +- k*delta, b +- k*delta, iterasi +- k).
+Enkripsi dibagi ke pool proses: peta permutasi setiap jumlah iterasi
+dihitung sekali di proses utama dan dibagikan lewat cache disk
+(memory-mapped), citra asli dan ciphertext dibagikan lewat memmap
+sehingga tidak ada array besar yang di-pickle antar proses.
+
+Contoh:
+    python sweep.py foto.png --iterasi 10 -a 0.1 -b 0.1 --steps 3 --delta 1e-10 --csv sweep.csv
+    python sweep.py foto.png --grid-iterasi 9 10 11 --grid-x0 0.1 0.1000000001 --grid-y0 0.1 --csv grid.csv
+"""
+import os
+import sys
+import csv
+import time
+import shutil
+import argparse
+import itertools
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+import permutation
+from cipher import load_image_for_encryption
+from keystream import KeystreamStream
+
+# Diisi initializer di setiap worker
+_worker = {}
+
+
+def perturbation_keys(iterasi, x0, y0, steps=2, delta=1e-10):
+    """Kunci dasar diikuti gangguan a +- k*delta, b +- k*delta dan iterasi +- k (k = 1..steps)."""
+    keys = [(iterasi, x0, y0)]
+    for k in range(1, steps + 1):
+        for sign in (-1, 1):
+            keys.append((iterasi, x0 + sign * k * delta, y0))
+            keys.append((iterasi, x0, y0 + sign * k * delta))
+            if iterasi + sign * k > 0:
+                keys.append((iterasi + sign * k, x0, y0))
+    return keys
+
+
+def grid_keys(iterations, x0_values, y0_values):
+    """Semua kombinasi (iterasi, a, b) dari tiga daftar nilai."""
+    return list(itertools.product(iterations, x0_values, y0_values))
+
+
+def _init_worker(plain_path, cipher_path, shape, n_keys, cache_dir):
+    permutation.configure_cache(cache_dir=cache_dir)
+    _worker["plain"] = np.load(plain_path, mmap_mode='r')
+    _worker["ciphers"] = np.memmap(cipher_path, dtype=np.uint8, mode='r+', shape=(n_keys,) + tuple(shape))
+
+
+def _encrypt_keys(iterasi, indexed_keys):
+    """Worker: satu permutasi ACM untuk semua kunci beriterasi sama, lalu XOR dengan keystream tiap kunci."""
+    plain, ciphers = _worker["plain"], _worker["ciphers"]
+    permuted = permutation.arnold_cat_map(np.asarray(plain), iterasi)
+    for index, x0, y0 in indexed_keys:
+        keystream = KeystreamStream(x0, y0).read(permuted.size).reshape(permuted.shape)
+        np.bitwise_xor(permuted, keystream, out=ciphers[index])
+    ciphers.flush()
+    return len(indexed_keys)
+
+
+def _pair_metrics(i, sample=None):
+    """Worker: NPCR dan UACI ciphertext ke-i terhadap semua ciphertext sesudahnya."""
+    ciphers = _worker["ciphers"]
+    flat = ciphers.reshape(len(ciphers), -1)
+    if sample is not None:
+        flat = flat[:, sample]
+    a = np.asarray(flat[i])
+    rows = []
+    for j in range(i + 1, len(flat)):
+        b = np.asarray(flat[j])
+        npcr = np.count_nonzero(a != b) / a.size * 100
+        uaci = (np.maximum(a, b) - np.minimum(a, b)).sum(dtype=np.int64) / (a.size * 255) * 100
+        rows.append((i, j, float(npcr), float(uaci)))
+    return rows
+
+
+def _correlation_matrix(ciphers, sample=None, block_bytes=64 * 1024 * 1024):
+    """Matriks korelasi Pearson antar ciphertext dari matriks Gram yang diakumulasi per blok kolom."""
+    flat = ciphers.reshape(len(ciphers), -1)
+    n_values = flat.shape[1] if sample is None else len(sample)
+    chunk = max(1, block_bytes // (8 * len(flat)))
+    gram = np.zeros((len(flat), len(flat)))
+    sums = np.zeros(len(flat))
+    for start in range(0, n_values, chunk):
+        cols = slice(start, start + chunk) if sample is None else sample[start:start + chunk]
+        block = np.asarray(flat[:, cols], dtype=np.float64)
+        gram += block @ block.T
+        sums += block.sum(axis=1)
+    mean = sums / n_values
+    cov = gram / n_values - np.outer(mean, mean)
+    std = np.sqrt(np.clip(np.diag(cov), 0, None))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return cov / np.outer(std, std)
+
+
+def run_sweep(fpath, keys, workers=None, sample_size=None, seed=0, progress=None):
+    """Mengenkripsi `fpath` dengan setiap kunci (iterasi, a, b) lalu membandingkan semua pasangan ciphertext.
+
+    Mengembalikan dict berisi keys, pairs (i, j, npcr, uaci, korelasi), summary
+    dan seconds. `sample_size` membatasi jumlah piksel untuk metrik pasangan.
+    """
+    if len(keys) < 2:
+        raise ValueError("Sweep membutuhkan minimal dua kunci.")
+    start_time = time.perf_counter()
+    arr, _ = load_image_for_encryption(fpath)
+    work_dir = tempfile.mkdtemp(prefix="acm_sweep_")
+    try:
+        plain_path = os.path.join(work_dir, "plain.npy")
+        np.save(plain_path, arr)
+        cipher_path = os.path.join(work_dir, "ciphers.raw")
+        ciphers = np.memmap(cipher_path, dtype=np.uint8, mode='w+', shape=(len(keys),) + arr.shape)
+        # Peta permutasi tiap iterasi dibuat sekali lalu dibaca worker dari cache disk
+        cache_dir = os.path.join(work_dir, "maps")
+        map_cache = permutation.PermutationCache(cache_dir=cache_dir)
+        groups = {}
+        for index, (iterasi, x0, y0) in enumerate(keys):
+            groups.setdefault(iterasi, []).append((index, x0, y0))
+        for iterasi in groups:
+            map_cache.get(arr.shape[0], iterasi, width=arr.shape[1])
+        # Warm-up Duffing (1000 langkah) bersifat per kunci; pecah grup agar semua worker kebagian kerja
+        workers = workers or os.cpu_count() or 1
+        chunk = max(1, -(-len(keys) // (workers * 2)))
+        tasks = [(iterasi, members[i:i + chunk]) for iterasi, members in groups.items()
+                 for i in range(0, len(members), chunk)]
+        sample = None
+        if sample_size is not None and sample_size < arr.size:
+            sample = np.sort(np.random.default_rng(seed).choice(arr.size, size=sample_size, replace=False))
+
+        pairs = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(plain_path, cipher_path, arr.shape, len(keys), cache_dir)) as executor:
+            try:
+                done = 0
+                for future in as_completed([executor.submit(_encrypt_keys, *task) for task in tasks]):
+                    done += future.result()
+                    if progress:
+                        progress("Enkripsi kunci", done / len(keys))
+                futures = [executor.submit(_pair_metrics, i, sample) for i in range(len(keys) - 1)]
+                for n_done, future in enumerate(as_completed(futures), start=1):
+                    pairs.extend(future.result())
+                    if progress:
+                        progress("NPCR/UACI pasangan", n_done / len(futures))
+            except BaseException:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+        if progress:
+            progress("Korelasi pasangan")
+        corr = _correlation_matrix(ciphers, sample)
+        pairs = sorted((i, j, npcr, uaci, float(corr[i, j])) for i, j, npcr, uaci in pairs)
+    finally:
+        ciphers = None
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {"keys": list(keys), "pairs": pairs, "summary": summarize(pairs),
+            "seconds": time.perf_counter() - start_time}
+
+
+def summarize(pairs):
+    """Statistik min/rata-rata/maks NPCR, UACI dan |korelasi| atas semua pasangan."""
+    values = np.array([p[2:] for p in pairs], dtype=np.float64)
+    summary = {"pairs": len(pairs)}
+    for column, name in enumerate(("npcr", "uaci", "abs_corr")):
+        col = np.abs(values[:, column]) if name == "abs_corr" else values[:, column]
+        summary[name] = {"min": float(np.nanmin(col)), "mean": float(np.nanmean(col)), "max": float(np.nanmax(col))}
+    return summary
+
+
+def write_csv(result, path):
+    """Tabel pasangan: indeks dan kunci kedua ciphertext beserta NPCR, UACI dan korelasinya."""
+    keys = result["keys"]
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["i", "j", "iterasi_i", "a_i", "b_i", "iterasi_j", "a_j", "b_j", "npcr", "uaci", "korelasi"])
+        for i, j, npcr, uaci, corr in result["pairs"]:
+            writer.writerow([i, j, *keys[i], *keys[j], f"{npcr:.6f}", f"{uaci:.6f}", f"{corr:.6f}"])
+
+
+def format_summary(result):
+    """Ringkasan singkat beberapa baris untuk CLI dan GUI."""
+    s = result["summary"]
+    return (f"{len(result['keys'])} kunci, {s['pairs']} pasangan dalam {result['seconds']:.2f} detik\n"
+            f"NPCR  min {s['npcr']['min']:.4f}%  rata-rata {s['npcr']['mean']:.4f}%  maks {s['npcr']['max']:.4f}%\n"
+            f"UACI  min {s['uaci']['min']:.4f}%  rata-rata {s['uaci']['mean']:.4f}%  maks {s['uaci']['max']:.4f}%\n"
+            f"|Korelasi| maks {s['abs_corr']['max']:.6f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Uji sensitivitas kunci ACM + Duffing Map (sweep kunci).")
+    parser.add_argument("input", help="Citra yang dienkripsi dengan setiap kunci")
+    parser.add_argument("--iterasi", type=int, default=10, help="Iterasi ACM kunci dasar (default: 10)")
+    parser.add_argument("-a", "--x0", type=float, default=0.1, help="Kunci dasar a / x0 (default: 0.1)")
+    parser.add_argument("-b", "--y0", type=float, default=0.1, help="Kunci dasar b / y0 (default: 0.1)")
+    parser.add_argument("--steps", type=int, default=2, help="Jumlah langkah gangguan per arah (default: 2)")
+    parser.add_argument("--delta", type=float, default=1e-10, help="Besar gangguan a/b per langkah (default: 1e-10)")
+    parser.add_argument("--grid-iterasi", type=int, nargs="+", help="Mode grid: daftar iterasi")
+    parser.add_argument("--grid-x0", type=float, nargs="+", help="Mode grid: daftar nilai a")
+    parser.add_argument("--grid-y0", type=float, nargs="+", help="Mode grid: daftar nilai b")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Jumlah worker proses (default: jumlah CPU)")
+    parser.add_argument("--sample", type=int, default=None, help="Jumlah piksel acak untuk metrik pasangan (default: semua)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed sampling (default: 0)")
+    parser.add_argument("--csv", help="Simpan tabel semua pasangan ke file CSV")
+    args = parser.parse_args(argv)
+
+    if args.grid_iterasi or args.grid_x0 or args.grid_y0:
+        keys = grid_keys(args.grid_iterasi or [args.iterasi], args.grid_x0 or [args.x0], args.grid_y0 or [args.y0])
+    else:
+        keys = perturbation_keys(args.iterasi, args.x0, args.y0, args.steps, args.delta)
+    try:
+        result = run_sweep(args.input, keys, args.workers, args.sample, args.seed)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    base_pairs = [p for p in result["pairs"] if p[0] == 0]
+    print(f"{'#':>3} {'iterasi':>7} {'a':>22} {'b':>22} {'NPCR vs #0':>11} {'UACI vs #0':>11} {'korelasi':>9}")
+    for _, j, npcr, uaci, corr in base_pairs:
+        iterasi, x0, y0 = keys[j]
+        print(f"{j:>3} {iterasi:>7} {x0!r:>22} {y0!r:>22} {npcr:>10.4f}% {uaci:>10.4f}% {corr:>9.5f}")
+    print("\n" + format_summary(result))
+    if args.csv:
+        write_csv(result, args.csv)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
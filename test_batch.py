@@ -0,0 +1,41 @@
+"""Uji mode batch: pool proses dan pemeriksaan nama output."""
+import os
+import numpy as np
+import pytest
+from PIL import Image
+
+from batch import run_batch, check_output_names
+
+KEY = (0.1, 0.2)
+
+
+def test_run_batch_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    originals = {}
+    for name, shape in (("a.png", (20, 20, 3)), ("b.bmp", (16, 24))):
+        originals[name] = rng.integers(0, 256, shape, dtype=np.uint8)
+        Image.fromarray(originals[name]).save(tmp_path / name)
+    paths = [str(tmp_path / name) for name in originals]
+    encrypted = run_batch("encrypt", paths, str(tmp_path / "enc"), 5, *KEY, workers=2)
+    assert [r["error"] for r in encrypted] == [None, None]
+    decrypted = run_batch("decrypt", [r["output"] for r in encrypted], str(tmp_path / "dec"), 5, *KEY, workers=2)
+    assert [r["error"] for r in decrypted] == [None, None]
+    for name, arr in originals.items():
+        np.testing.assert_array_equal(np.array(Image.open(tmp_path / "dec" / ("Decrypted_" + os.path.splitext(name)[0] + ".png"))), arr)
+
+
+def test_duplicate_output_names_are_rejected(tmp_path):
+    paths = [str(tmp_path / "a.png"), str(tmp_path / "a.jpg"), str(tmp_path / "b.png")]
+    with pytest.raises(ValueError, match="a.png"):
+        check_output_names("encrypt", paths)
+    with pytest.raises(ValueError):
+        run_batch("encrypt", paths, str(tmp_path / "out"), 5, *KEY)
+    assert not (tmp_path / "out").exists()
+    check_output_names("encrypt", paths[1:])
+
+
+def test_low_memory_decrypt_names_end_in_png():
+    paths = ["Encrypted_a.png", "Encrypted_a.bmp"]
+    check_output_names("decrypt", paths)
+    with pytest.raises(ValueError):
+        check_output_names("decrypt", paths, memory_budget=1 << 20)
@@ -0,0 +1,94 @@
+"""Uji kontainer .acm: round trip, cek kunci dan header/piksel yang rusak."""
+import struct
+import numpy as np
+import pytest
+from PIL import Image
+
+from cipher import encrypt_file, decrypt_file
+from container import (ContainerError, write_container, read_header, load_container, check_key, new_salt,
+                       HEADER_SIZE, KDF_ITERATIONS)
+from image_stats import analyze_file, analyze_image
+from test_permutation import random_image
+
+KEY = (0.1, 0.2)
+# Offset field iterasi PBKDF2: field terakhir dari struktur header
+_KDF_OFFSET = struct.calcsize('<4sHHI4sB3xI8sII16s')
+
+
+@pytest.fixture
+def container_path(tmp_path):
+    src = tmp_path / "input.png"
+    Image.fromarray(random_image((24, 40), "RGB")).save(src)
+    return encrypt_file(str(src), str(tmp_path), 5, *KEY, output_format="acm")
+
+
+def _patch(path, offset, data):
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        f.write(data)
+
+
+def test_round_trip(tmp_path, container_path):
+    header = read_header(container_path)
+    assert (header.height, header.width, header.mode, header.iterations) == (24, 40, "RGB", 5)
+    assert header.kdf_iterations == KDF_ITERATIONS
+    decrypted = decrypt_file(container_path, str(tmp_path), 5, *KEY)
+    np.testing.assert_array_equal(np.array(Image.open(decrypted)), np.array(Image.open(tmp_path / "input.png")))
+
+
+def test_shared_salt_is_stored(tmp_path):
+    salt = new_salt()
+    for name in ("a.acm", "b.acm"):
+        write_container(str(tmp_path / name), random_image((8, 8), "L"), 3, *KEY, salt)
+    assert read_header(str(tmp_path / "a.acm")).salt == read_header(str(tmp_path / "b.acm")).salt == salt
+
+
+@pytest.mark.parametrize("iterasi, x0, y0, message", [
+    (5, 0.1, 0.2 + 1e-12, "Kunci"),
+    (5, 0.3, 0.2, "Kunci"),
+    (6, 0.1, 0.2, "Iterasi ACM"),
+])
+def test_wrong_key_or_iterations_are_detected(tmp_path, container_path, iterasi, x0, y0, message):
+    header, _ = load_container(container_path)
+    with pytest.raises(ContainerError, match=message):
+        check_key(header, iterasi, x0, y0)
+    with pytest.raises(ContainerError, match=message):
+        decrypt_file(container_path, str(tmp_path), iterasi, x0, y0)
+
+
+def test_corrupt_pixels_fail_checksum(container_path):
+    with open(container_path, 'rb') as f:
+        f.seek(HEADER_SIZE + 100)
+        value = f.read(1)[0]
+    _patch(container_path, HEADER_SIZE + 100, bytes([value ^ 0xFF]))
+    with pytest.raises(ContainerError, match="Checksum"):
+        load_container(container_path)
+    load_container(container_path, verify=False)
+
+
+@pytest.mark.parametrize("rounds", [0, 1, KDF_ITERATIONS + 1, 0xFFFFFFFF])
+def test_unexpected_kdf_iterations_are_rejected(container_path, rounds):
+    _patch(container_path, _KDF_OFFSET, struct.pack('<I', rounds))
+    with pytest.raises(ContainerError, match="PBKDF2"):
+        read_header(container_path)
+
+
+def test_truncated_or_foreign_files_are_rejected(tmp_path, container_path):
+    with open(container_path, 'r+b') as f:
+        f.truncate(HEADER_SIZE + 10)
+    with pytest.raises(ContainerError, match="Ukuran"):
+        read_header(container_path)
+    foreign = tmp_path / "foreign.acm"
+    foreign.write_bytes(b"PNG" + bytes(100))
+    with pytest.raises(ContainerError):
+        read_header(str(foreign))
+    _patch(container_path, 4, struct.pack('<H', 2))
+    with pytest.raises(ContainerError, match="Versi"):
+        read_header(container_path)
+
+
+def test_statistics_report_reads_containers(container_path):
+    report = analyze_file(container_path)
+    _, pixels = load_container(container_path)
+    assert (report["width"], report["height"]) == (40, 24)
+    assert report["entropy"] == analyze_image(np.asarray(pixels))["entropy"]
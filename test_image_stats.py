@@ -0,0 +1,60 @@
+"""Uji mesin statistik: hasil tervektorisasi dibandingkan dengan np.histogram / np.corrcoef."""
+import numpy as np
+import pytest
+
+from image_stats import (DIRECTIONS, channel_histograms, calculate_entropy, adjacent_correlation, adjacent_pairs,
+                         npcr_uaci)
+from test_permutation import random_image
+
+
+def correlated_image(shape, mode, seed=0):
+    """Citra dengan korelasi tetangga yang jelas (gradien + derau), agar koefisiennya tidak ~0."""
+    arr = random_image(shape, mode, seed).astype(np.int64) // 4
+    ramp = np.add.outer(np.arange(shape[0]), np.arange(shape[1])) * 3
+    if arr.ndim == 3:
+        ramp = ramp[:, :, None]
+    return ((arr + ramp) % 256).astype(np.uint8)
+
+
+def _channels(arr):
+    return [arr] if arr.ndim == 2 else [arr[:, :, c] for c in range(3)]
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB"])
+def test_histograms_and_entropy_match_numpy(mode):
+    arr = correlated_image((37, 53), mode)
+    histograms = channel_histograms(arr)
+    expected = [np.histogram(channel, bins=256, range=(0, 256))[0] for channel in _channels(arr)]
+    np.testing.assert_array_equal(histograms, expected)
+    entropies = []
+    for counts in expected:
+        p = counts[counts > 0] / counts.sum()
+        entropies.append(-np.sum(p * np.log2(p)))
+    assert calculate_entropy(arr) == pytest.approx(np.mean(entropies), rel=1e-12)
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB"])
+def test_adjacent_correlation_matches_corrcoef(mode):
+    arr = correlated_image((37, 53), mode)
+    result = adjacent_correlation(arr)
+    for c, channel in enumerate(_channels(arr)):
+        for d, direction in enumerate(DIRECTIONS):
+            x, y = adjacent_pairs(channel, direction)
+            assert result[c, d] == pytest.approx(np.corrcoef(x.ravel(), y.ravel())[0, 1], abs=1e-12)
+
+
+def test_sampled_correlation_is_reproducible():
+    arr = correlated_image((64, 64), "RGB")
+    sampled = adjacent_correlation(arr, sample_size=500, seed=3)
+    np.testing.assert_array_equal(sampled, adjacent_correlation(arr, sample_size=500, seed=3))
+    np.testing.assert_allclose(sampled, adjacent_correlation(arr), atol=0.2)
+
+
+def test_npcr_uaci_match_definition():
+    a, b = random_image((30, 40), "RGB", seed=1), random_image((30, 40), "RGB", seed=2)
+    npcr, uaci = npcr_uaci(a, b)
+    assert npcr == pytest.approx(np.mean(a != b) * 100)
+    assert uaci == pytest.approx(np.mean(np.abs(a.astype(int) - b.astype(int)) / 255) * 100)
+    assert npcr_uaci(a, a) == (0.0, 0.0)
+    with pytest.raises(ValueError):
+        npcr_uaci(a, b[:, :-1])
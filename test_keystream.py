@@ -0,0 +1,46 @@
+"""
+Uji keystream Duffing: generator berbasis blok dan cache harus identik byte
+per byte dengan generator berbasis list versi awal aplikasi.
+"""
+import numpy as np
+import pytest
+
+from keystream import generate_keystream_duffing_map, KeystreamStream
+
+KEY = (0.1, 0.2)
+
+
+def reference_keystream(total_values, x0, y0):
+    """Generator keystream Duffing berbasis list seperti versi awal aplikasi."""
+    duffing_a, duffing_b = 2.75, 0.2
+    keystream_sequence = []
+    x, y = x0, y0
+    for _ in range(1000):
+        x, y = y, -duffing_b * x + duffing_a * y - y**3
+    for _ in range(total_values):
+        x, y = y, -duffing_b * x + duffing_a * y - y**3
+        keystream_sequence.append(int(abs(y) % 1 * 256))
+    return np.array(keystream_sequence, dtype=np.uint8)
+
+
+@pytest.mark.parametrize("channels", [1, 3])
+@pytest.mark.parametrize("n", [1, 17, 64])
+def test_keystream_matches_list_generator(n, channels):
+    expected = reference_keystream(n * n * channels, *KEY)
+    keystream = generate_keystream_duffing_map(n, *KEY, channels=channels)
+    np.testing.assert_array_equal(keystream.ravel(), expected)
+    # Permintaan yang lebih pendek memakai prefiks dari cache, yang lebih panjang melanjutkan state
+    np.testing.assert_array_equal(generate_keystream_duffing_map(n, *KEY, channels=1).ravel(), expected[:n * n])
+    longer = reference_keystream(4 * n * n * channels, *KEY)
+    np.testing.assert_array_equal(generate_keystream_duffing_map(2 * n, *KEY, channels=channels).ravel(), longer)
+
+
+def test_keystream_depends_on_key():
+    assert not np.array_equal(generate_keystream_duffing_map(16, 0.1, 0.2), generate_keystream_duffing_map(16, 0.1, 0.2 + 1e-10))
+
+
+def test_keystream_stream_matches_list_generator():
+    expected = reference_keystream(5000, *KEY)
+    stream = KeystreamStream(*KEY)
+    parts = [stream.read(count) for count in (1, 999, 3000, 1000)]
+    np.testing.assert_array_equal(np.concatenate(parts), expected)
@@ -0,0 +1,61 @@
+"""
+Uji mode hemat memori: ciphertext per blok baris harus identik dengan jalur
+in-memory `cipher`, untuk PNG dan kontainer .acm.
+"""
+import numpy as np
+import pytest
+from PIL import Image
+
+from cipher import encrypt_file, decrypt_file
+from container import load_container
+from lowmem import encrypt_file_lowmem, decrypt_file_lowmem
+from test_permutation import random_image
+
+KEY = (0.1, 0.2)
+# Anggaran kecil memaksa beberapa blok baris
+BUDGET = 20_000
+
+
+@pytest.mark.parametrize("output_format", ["png", "acm"])
+@pytest.mark.parametrize("mode", ["L", "RGB"])
+@pytest.mark.parametrize("shape", [(48, 48), (40, 64), (64, 40)])
+@pytest.mark.parametrize("iterasi", [0, 7, 37])
+def test_lowmem_matches_in_memory(tmp_path, shape, mode, iterasi, output_format):
+    src = tmp_path / "input.png"
+    Image.fromarray(random_image(shape, mode, seed=iterasi), mode=mode).save(src)
+    regular_dir, lowmem_dir = tmp_path / "regular", tmp_path / "lowmem"
+    regular_dir.mkdir()
+    lowmem_dir.mkdir()
+
+    regular = encrypt_file(str(src), str(regular_dir), iterasi, *KEY, output_format=output_format)
+    lowmem = encrypt_file_lowmem(str(src), str(lowmem_dir), iterasi, *KEY, memory_budget=BUDGET,
+                                 output_format=output_format)
+    if output_format == "acm":
+        regular_pixels, lowmem_pixels = load_container(regular)[1], load_container(lowmem)[1]
+    else:
+        regular_pixels, lowmem_pixels = np.array(Image.open(regular)), np.array(Image.open(lowmem))
+    np.testing.assert_array_equal(lowmem_pixels, regular_pixels)
+
+    decrypted_regular = decrypt_file(regular, str(regular_dir), iterasi, *KEY)
+    decrypted_lowmem = decrypt_file_lowmem(lowmem, str(lowmem_dir), iterasi, *KEY, memory_budget=BUDGET)
+    original = np.array(Image.open(src))
+    np.testing.assert_array_equal(np.array(Image.open(decrypted_regular)), original)
+    np.testing.assert_array_equal(np.array(Image.open(decrypted_lowmem)), original)
+
+
+@pytest.mark.parametrize("name", ["input.bmp", "input.jpg"])
+def test_lowmem_reads_other_formats(tmp_path, name):
+    src = tmp_path / name
+    Image.fromarray(random_image((32, 32), "RGB")).save(src)
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    regular = encrypt_file(str(src), str(tmp_path), 5, *KEY)
+    lowmem = encrypt_file_lowmem(str(src), str(out_dir), 5, *KEY, memory_budget=BUDGET)
+    np.testing.assert_array_equal(np.array(Image.open(lowmem)), np.array(Image.open(regular)))
+
+
+def test_unstreamable_input_over_budget_is_rejected(tmp_path):
+    src = tmp_path / "input.jpg"
+    Image.fromarray(random_image((64, 64), "RGB")).save(src)
+    with pytest.raises(ValueError, match="anggaran memori"):
+        encrypt_file_lowmem(str(src), str(tmp_path), 5, *KEY, memory_budget=64 * 64 * 3 - 1)
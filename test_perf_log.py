@@ -0,0 +1,61 @@
+"""Uji instrumentasi tahap dan log performa JSON Lines."""
+import json
+import numpy as np
+from PIL import Image
+
+import perf_log
+from perf_log import StageTimer, write_record
+from lowmem import encrypt_file_lowmem
+from pipeline import CipherPipeline
+from test_permutation import random_image
+
+
+def test_merged_stages_are_recorded_once():
+    timer = StageTimer("encrypt", trace_memory=False)
+    for _ in range(3):
+        with timer.stage("Permutasi ACM", merge=True):
+            pass
+        with timer.stage("Difusi XOR", merge=True):
+            pass
+    timer.record_stage("encode", 0.5)
+    timer.finish()
+    assert [s["name"] for s in timer.stages] == ["Permutasi ACM", "Difusi XOR", "encode"]
+    assert timer.stages[2]["seconds"] == 0.5
+    assert all(s["seconds"] >= 0 and "memory_source" in s for s in timer.stages[:2])
+
+
+def test_stage_peak_includes_short_lived_allocations():
+    timer = StageTimer("encrypt", trace_memory=False)
+    with timer.stage("alokasi"):
+        buffer = np.ones(64 * 1024 * 1024, dtype=np.uint8)
+        del buffer
+    stage = timer.finish().stages[0]
+    if stage["memory_source"] == "peak_rss":
+        assert stage["peak_rss_delta_bytes"] >= 32 * 1024 * 1024
+
+
+def _records(log_path):
+    with open(log_path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_low_memory_and_pipeline_runs_are_logged(tmp_path, monkeypatch):
+    log_path = tmp_path / "perf.jsonl"
+    monkeypatch.setattr(perf_log, "_log_path", str(log_path))
+    src = tmp_path / "input.png"
+    Image.fromarray(random_image((24, 32), "RGB")).save(src)
+
+    encrypt_file_lowmem(str(src), str(tmp_path), 5, 0.1, 0.2, memory_budget=20_000)
+    CipherPipeline("encrypt", str(tmp_path / "pipeline"), 5, 0.1, 0.2).run([str(src)])
+    lowmem_record, pipeline_record = _records(log_path)
+    assert lowmem_record["low_memory"] and lowmem_record["width"] == 32
+    assert {"Dekode citra", "Permutasi ACM", "Keystream Duffing", "Difusi XOR", "Encode PNG"} \
+        == {s["name"] for s in lowmem_record["stages"]}
+    assert pipeline_record["pipeline"] and {s["name"] for s in pipeline_record["stages"]} \
+        == {"decode", "permute", "keystream_wait", "xor", "encode"}
+
+
+def test_write_record_without_log_is_noop(tmp_path, monkeypatch):
+    monkeypatch.setattr(perf_log, "_log_path", None)
+    write_record(StageTimer("encrypt", trace_memory=False))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,105 @@
+"""
+Uji permutasi ACM: peta indeks tervektorisasi harus identik bit per bit
+dengan loop piksel versi awal aplikasi. Untuk citra tidak persegi loop
+acuan dijalankan berurutan per jendela `acm_windows`.
+"""
+import numpy as np
+import pytest
+
+from permutation import (arnold_cat_map, inverse_arnold_cat_map, acm_period, acm_index_map, acm_source_coords,
+                         acm_windows, PermutationCache)
+
+ITERATIONS = [0, 1, 5, 37]
+NON_SQUARE_SHAPES = [(16, 24), (24, 16), (10, 25), (1, 9), (3, 40)]
+
+
+def reference_acm_square(image_array, iterasi, inverse=False):
+    """ACM (a=1, b=1) dengan loop piksel seperti versi awal aplikasi."""
+    n = image_array.shape[0]
+    processed_array = np.copy(image_array)
+    for _ in range(iterasi):
+        temp_array = np.zeros_like(processed_array)
+        for y in range(n):
+            for x in range(n):
+                if inverse:
+                    x_baru, y_baru = (2 * x - y) % n, (-x + y) % n
+                else:
+                    x_baru, y_baru = (x + y) % n, (x + 2 * y) % n
+                temp_array[y_baru, x_baru] = processed_array[y, x]
+        processed_array = temp_array
+    return processed_array
+
+
+def reference_acm(image_array, iterasi, inverse=False):
+    """Loop acuan yang diterapkan berurutan pada setiap jendela persegi (invers: urutan terbalik)."""
+    h, w = image_array.shape[:2]
+    result = np.copy(image_array)
+    windows = acm_windows(h, w)
+    for top, left, side in (windows[::-1] if inverse else windows):
+        window = result[top:top + side, left:left + side]
+        result[top:top + side, left:left + side] = reference_acm_square(window, iterasi, inverse)
+    return result
+
+
+def random_image(shape, mode, seed=0):
+    full_shape = shape if mode == 'L' else shape + (3,)
+    return np.random.default_rng(seed).integers(0, 256, full_shape, dtype=np.uint8)
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB"])
+@pytest.mark.parametrize("n", [1, 2, 17, 24])
+@pytest.mark.parametrize("iterasi", ITERATIONS)
+def test_acm_matches_pixel_loop(n, mode, iterasi):
+    arr = random_image((n, n), mode)
+    encrypted = arnold_cat_map(arr, iterasi)
+    np.testing.assert_array_equal(encrypted, reference_acm_square(arr, iterasi))
+    decrypted = inverse_arnold_cat_map(encrypted, iterasi)
+    np.testing.assert_array_equal(decrypted, reference_acm_square(encrypted, iterasi, inverse=True))
+    np.testing.assert_array_equal(decrypted, arr)
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB"])
+@pytest.mark.parametrize("shape", NON_SQUARE_SHAPES)
+@pytest.mark.parametrize("iterasi", ITERATIONS)
+def test_non_square_acm_matches_window_loop(shape, mode, iterasi):
+    arr = random_image(shape, mode)
+    encrypted = arnold_cat_map(arr, iterasi)
+    np.testing.assert_array_equal(encrypted, reference_acm(arr, iterasi))
+    decrypted = inverse_arnold_cat_map(encrypted, iterasi)
+    np.testing.assert_array_equal(decrypted, reference_acm(encrypted, iterasi, inverse=True))
+    np.testing.assert_array_equal(decrypted, arr)
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+@pytest.mark.parametrize("iterasi", [0, 5, 37])
+@pytest.mark.parametrize("shape", NON_SQUARE_SHAPES + [(17, 17), (40, 3)])
+def test_source_coord_blocks_match_index_map(shape, iterasi, inverse):
+    # Varian per blok baris (mode hemat memori) harus sama dengan peta penuh yang dibangun per irisan jendela
+    h, w = shape
+    index_map = acm_index_map(h, iterasi, inverse=inverse, width=w).reshape(h, w)
+    for start in range(0, h, 3):
+        src_y, src_x = acm_source_coords(h, iterasi, start, min(start + 3, h), inverse=inverse, width=w)
+        np.testing.assert_array_equal(src_y * w + src_x, index_map[start:start + 3])
+
+
+@pytest.mark.parametrize("n", [2, 17, 24])
+def test_acm_period_restores_image(n):
+    arr = random_image((n, n), 'L')
+    np.testing.assert_array_equal(reference_acm_square(arr, acm_period(n)), arr)
+    np.testing.assert_array_equal(arnold_cat_map(arr, acm_period(n) + 3), arnold_cat_map(arr, 3))
+
+
+def test_disk_cache_reuses_maps(tmp_path):
+    PermutationCache(cache_dir=str(tmp_path)).get(12, 5)
+    cache = PermutationCache(cache_dir=str(tmp_path))
+    forward = cache.get(12, 5)
+    assert isinstance(forward, np.memmap)
+    np.testing.assert_array_equal(forward, acm_index_map(12, 5))
+
+
+@pytest.mark.parametrize("foreign", [np.zeros(5, dtype=np.int32), np.zeros(144, dtype=np.float64)])
+def test_disk_cache_ignores_foreign_maps(tmp_path, foreign):
+    for suffix in ("fwd", "inv"):
+        np.save(tmp_path / f"acm_12_5_{suffix}.npy", foreign)
+    cache = PermutationCache(cache_dir=str(tmp_path))
+    np.testing.assert_array_equal(cache.get(12, 5), acm_index_map(12, 5))
@@ -0,0 +1,78 @@
+"""Uji mode sekuens frame: round trip direktori dan file multi-frame, dengan dan tanpa keystream per frame."""
+import os
+import numpy as np
+import pytest
+from PIL import Image
+
+from cipher import encrypt_file
+from sequence import SequenceCipher
+from test_permutation import random_image
+
+KEY = (0.1, 0.2)
+
+
+def _write_frames(frame_dir, count, shape=(18, 30), mode="RGB"):
+    frame_dir.mkdir()
+    frames = [random_image(shape, mode, seed=i) for i in range(count)]
+    for i, frame in enumerate(frames):
+        Image.fromarray(frame, mode=mode).save(frame_dir / f"frame_{i:03d}.png")
+    return frames
+
+
+@pytest.mark.parametrize("output_format", ["png", "acm"])
+@pytest.mark.parametrize("per_frame_keystream", [False, True])
+def test_sequence_round_trip(tmp_path, per_frame_keystream, output_format):
+    frames = _write_frames(tmp_path / "frames", 4)
+    options = dict(per_frame_keystream=per_frame_keystream)
+    encrypted = SequenceCipher("encrypt", str(tmp_path / "enc"), 7, *KEY, output_format=output_format, **options) \
+        .run(str(tmp_path / "frames"))
+    assert encrypted["frames"] == 4
+    decrypted = SequenceCipher("decrypt", str(tmp_path / "dec"), 7, *KEY, **options).run(str(tmp_path / "enc"))
+    for frame, path in zip(frames, decrypted["outputs"]):
+        np.testing.assert_array_equal(np.array(Image.open(path)), frame)
+
+
+def test_per_frame_keystream_differs_between_frames(tmp_path):
+    _write_frames(tmp_path / "frames", 2)
+    # Frame yang sama dua kali: keystream bersama memberi ciphertext sama, keystream per frame tidak
+    Image.open(tmp_path / "frames" / "frame_000.png").save(tmp_path / "frames" / "frame_001.png")
+    outputs = {}
+    for per_frame in (False, True):
+        out_dir = tmp_path / f"enc_{per_frame}"
+        outputs[per_frame] = SequenceCipher("encrypt", str(out_dir), 7, *KEY, per_frame_keystream=per_frame) \
+            .run(str(tmp_path / "frames"))["outputs"]
+    shared = [np.array(Image.open(p)) for p in outputs[False]]
+    per_frame = [np.array(Image.open(p)) for p in outputs[True]]
+    np.testing.assert_array_equal(shared[0], shared[1])
+    assert not np.array_equal(per_frame[0], per_frame[1])
+    # Frame pertama identik dengan enkripsi citra tunggal
+    single = encrypt_file(str(tmp_path / "frames" / "frame_000.png"), str(tmp_path), 7, *KEY)
+    np.testing.assert_array_equal(per_frame[0], np.array(Image.open(single)))
+
+
+def test_per_frame_keystream_needs_same_option_to_decrypt(tmp_path):
+    frames = _write_frames(tmp_path / "frames", 2)
+    SequenceCipher("encrypt", str(tmp_path / "enc"), 7, *KEY, per_frame_keystream=True).run(str(tmp_path / "frames"))
+    decrypted = SequenceCipher("decrypt", str(tmp_path / "dec"), 7, *KEY).run(str(tmp_path / "enc"))
+    np.testing.assert_array_equal(np.array(Image.open(decrypted["outputs"][0])), frames[0])
+    assert not np.array_equal(np.array(Image.open(decrypted["outputs"][1])), frames[1])
+
+
+def test_multi_frame_tiff_round_trip(tmp_path):
+    frames = [random_image((16, 16), "L", seed=i) for i in range(3)]
+    images = [Image.fromarray(f, mode="L") for f in frames]
+    images[0].save(tmp_path / "clip.tif", save_all=True, append_images=images[1:])
+    encrypted = SequenceCipher("encrypt", str(tmp_path / "enc"), 4, *KEY, per_frame_keystream=True) \
+        .run(str(tmp_path / "clip.tif"))
+    assert [os.path.basename(p) for p in encrypted["outputs"]] == [f"Encrypted_clip_{i:05d}.png" for i in range(3)]
+    decrypted = SequenceCipher("decrypt", str(tmp_path / "dec"), 4, *KEY, per_frame_keystream=True) \
+        .run(str(tmp_path / "enc"))
+    for frame, path in zip(frames, decrypted["outputs"]):
+        np.testing.assert_array_equal(np.array(Image.open(path)), frame)
+
+
+def test_mismatched_frame_size_is_rejected(tmp_path):
+    _write_frames(tmp_path / "frames", 2)
+    Image.fromarray(random_image((10, 10), "RGB")).save(tmp_path / "frames" / "frame_002.png")
+    with pytest.raises(ValueError, match="berbeda"):
+        SequenceCipher("encrypt", str(tmp_path / "enc"), 7, *KEY).run(str(tmp_path / "frames"))